@@ -4,11 +4,13 @@
 ######
 import numpy as np
 import pandas as pd
-import plotly.offline as pyo
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import report
 
 # create fake data:
 df = pd.DataFrame(np.random.randn(100,4),columns='A B C D'.split())
-pyo.plot([{
+report.plot([{
     'x': df.index,
     'y': df[col],
     'name': col
@@ -3,7 +3,9 @@
 # obtain the same points we do!) between 1 and 100 in both
 # vertical and horizontal directions.
 ######
-import plotly.offline as pyo
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import report
 import plotly.graph_objs as go
 import numpy as np
 
@@ -17,4 +19,4 @@ data = [go.Scatter(
     mode = 'markers',
 )]
 
-pyo.plot(data, filename='scatter1.html')
+report.plot(data, filename='scatter1.html')
@@ -3,7 +3,9 @@
 # obtain the same points we do!) between 1 and 100 in both
 # vertical and horizontal directions.
 ######
-import plotly.offline as pyo
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import report
 import plotly.graph_objs as go
 import numpy as np
 
@@ -23,4 +25,4 @@ layout = go.Layout(
     hovermode ='closest' # handles multiple points landing on the same vertical
 )
 fig = go.Figure(data=data, layout=layout)
-pyo.plot(fig, filename='scatter2.html')
+report.plot(fig, filename='scatter2.html')
@@ -7,7 +7,9 @@
 ######
 
 # Perform imports here:
-import plotly.offline as pyo
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import report
 import plotly.graph_objs as go
 import numpy as np
 
@@ -32,4 +34,4 @@ layout = go.Layout(
 
 # Create a fig from data and layout, and plot the fig
 fig = go.Figure(data=data, layout=layout)
-pyo.plot(fig, filename='solution1.html')
+report.plot(fig, filename='solution1.html')
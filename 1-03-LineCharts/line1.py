@@ -2,7 +2,9 @@
 # This line chart displays the same data
 # three different ways along the y-axis.
 ######
-import plotly.offline as pyo
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import report
 import plotly.graph_objs as go
 import numpy as np
 
@@ -34,4 +36,4 @@ layout = go.Layout(
     title = 'Line chart showing three different modes'
 )
 fig = go.Figure(data=data,layout=layout)
-pyo.plot(fig, filename='line1.html')
+report.plot(fig, filename='line1.html')
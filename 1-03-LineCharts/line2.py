@@ -2,7 +2,9 @@
 # This line chart shows U.S. Census Bureau
 # population data from six New England states.
 ######
-import plotly.offline as pyo
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import report
 import plotly.graph_objs as go
 import pandas as pd
 
@@ -22,4 +24,4 @@ layout = go.Layout(
 )
 
 fig = go.Figure(data=traces,layout=layout)
-pyo.plot(fig, filename='line2.html')
+report.plot(fig, filename='line2.html')
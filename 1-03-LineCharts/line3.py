@@ -3,7 +3,9 @@
 # population data from six New England states.
 # THIS PLOT USES PANDAS TO EXTRACT DESIRED DATA FROM THE SOURCE
 ######
-import plotly.offline as pyo
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import report
 import plotly.graph_objs as go
 import pandas as pd
 
@@ -30,4 +32,4 @@ layout = go.Layout(
 )
 
 fig = go.Figure(data=traces,layout=layout)
-pyo.plot(fig, filename='line3.html')
+report.plot(fig, filename='line3.html')
@@ -9,7 +9,9 @@
 ######
 
 # Perform imports here:
-import plotly.offline as pyo
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import report
 import plotly.graph_objs as go
 import pandas as pd
 
@@ -31,4 +33,4 @@ layout = go.Layout(
 
 # Create a fig from data and layout, and plot the fig
 fig = go.Figure(data=data, layout=layout)
-pyo.plot(fig, filename='solution2b.html')
+report.plot(fig, filename='solution2b.html')
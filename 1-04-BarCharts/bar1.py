@@ -2,11 +2,12 @@
 # A basic bar chart showing the total number of
 # 2018 Winter Olympics Medals won by Country.
 ######
-import plotly.offline as pyo
 import plotly.graph_objs as go
-import pandas as pd
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import datasets, report
 
-df = pd.read_csv('../data/2018WinterOlympics.csv')
+df = datasets.read_csv('2018WinterOlympics.csv')
 
 data = [go.Bar(
     x=df['NOC'],  # NOC stands for National Olympic Committee
@@ -16,4 +17,4 @@ layout = go.Layout(
     title='2018 Winter Olympic Medals by Country'
 )
 fig = go.Figure(data=data, layout=layout)
-pyo.plot(fig, filename='bar1.html')
+report.plot(fig, filename='bar1.html')
@@ -3,11 +3,12 @@
 # (gold, silver and bronze medals won) for each country
 # that competed in the 2018 Winter Olympics.
 ######
-import plotly.offline as pyo
 import plotly.graph_objs as go
-import pandas as pd
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import datasets, report
 
-df = pd.read_csv('../data/2018WinterOlympics.csv')
+df = datasets.read_csv('2018WinterOlympics.csv')
 
 trace1 = go.Bar(
     x=df['NOC'],  # NOC stands for National Olympic Committee
@@ -32,4 +33,4 @@ layout = go.Layout(
     title='2018 Winter Olympic Medals by Country'
 )
 fig = go.Figure(data=data, layout=layout)
-pyo.plot(fig, filename='bar2.html')
+report.plot(fig, filename='bar2.html')
@@ -3,11 +3,12 @@
 # with the added feature that the size of the
 # marker can be set by the data.
 ######
-import plotly.offline as pyo
 import plotly.graph_objs as go
-import pandas as pd
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import datasets, report
 
-df = pd.read_csv('../data/mpg.csv')
+df = datasets.read_csv('mpg.csv')
 
 data = [go.Scatter(          # start with a normal scatter plot
     x=df['horsepower'],
@@ -24,4 +25,4 @@ layout = go.Layout(
     hovermode='closest'
 )
 fig = go.Figure(data=data, layout=layout)
-pyo.plot(fig, filename='bubble1.html')
+report.plot(fig, filename='bubble1.html')
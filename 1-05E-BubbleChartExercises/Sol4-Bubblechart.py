@@ -5,7 +5,9 @@
 ######
 
 # Perform imports here:
-import plotly.offline as pyo
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import report
 import plotly.graph_objs as go
 import pandas as pd
 
@@ -31,7 +33,7 @@ layout = go.Layout(
 
 # create a fig from data & layout, and plot the fig
 fig = go.Figure(data=data, layout=layout)
-pyo.plot(fig, filename='solution4.html')
+report.plot(fig, filename='solution4.html')
 #######
 # So what happened?? Why is the trend sloping downward?
 # Remember that acceleration is the number of seconds to go from 0 to 60mph,
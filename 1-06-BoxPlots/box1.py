@@ -2,7 +2,9 @@
 # This simple box plot places the box beside
 # the original data points on the same graph.
 ######
-import plotly.offline as pyo
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import report
 import plotly.graph_objs as go
 
 # set up an array of 20 data points, with 20 as the median value
@@ -16,4 +18,4 @@ data = [
         pointpos=-1.8    # offset them to the left of the box
     )
 ]
-pyo.plot(data, filename='box1.html')
+report.plot(data, filename='box1.html')
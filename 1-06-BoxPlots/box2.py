@@ -2,7 +2,9 @@
 # This simple box plot displays outliers
 # above and below the box.
 ######
-import plotly.offline as pyo
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import report
 import plotly.graph_objs as go
 
 # set up an array of 20 data points, with 20 as the median value
@@ -14,4 +16,4 @@ data = [
         boxpoints='outliers' # display only outlying data points
     )
 ]
-pyo.plot(data, filename='box2.html')
+report.plot(data, filename='box2.html')
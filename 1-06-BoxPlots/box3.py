@@ -3,7 +3,9 @@
 # of three-letter-words in the works of
 # Quintus Curtius Snodgrass and Mark Twain
 ######
-import plotly.offline as pyo
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import report
 import plotly.graph_objs as go
 
 snodgrass = [.209,.205,.196,.210,.202,.207,.224,.223,.220,.201]
@@ -24,4 +26,4 @@ layout = go.Layout(
     between Quintus Curtius Snodgrass and Mark Twain'
 )
 fig = go.Figure(data=data, layout=layout)
-pyo.plot(fig, filename='box3.html')
+report.plot(fig, filename='box3.html')
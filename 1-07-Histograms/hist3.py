@@ -1,11 +1,12 @@
 #######
 # This histogram has narrower bins than the previous hist1.py
 ######
-import plotly.offline as pyo
 import plotly.graph_objs as go
-import pandas as pd
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import datasets, report
 
-df = pd.read_csv('../data/mpg.csv')
+df = datasets.read_csv('mpg.csv')
 
 data = [go.Histogram(
     x=df['mpg'],
@@ -17,4 +18,4 @@ layout = go.Layout(
     1970's Era Vehicles"
 )
 fig = go.Figure(data=data, layout=layout)
-pyo.plot(fig, filename='narrow_histogram.html')
+report.plot(fig, filename='narrow_histogram.html')
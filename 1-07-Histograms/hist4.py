@@ -1,11 +1,12 @@
 #######
 # This histogram compares heights by gender
 ######
-import plotly.offline as pyo
 import plotly.graph_objs as go
-import pandas as pd
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import datasets, report
 
-df = pd.read_csv('../data/arrhythmia.csv')
+df = datasets.read_csv('arrhythmia.csv')
 
 data = [go.Histogram(
     x=df[df['Sex']==0]['Height'],
@@ -23,4 +24,4 @@ layout = go.Layout(
     title="Height comparison by gender"
 )
 fig = go.Figure(data=data, layout=layout)
-pyo.plot(fig, filename='basic_histogram2.html')
+report.plot(fig, filename='basic_histogram2.html')
@@ -2,7 +2,9 @@
 # This histogram displays the number of Reddit button presses
 # over the two months of their social experiment.
 ######
-import plotly.offline as pyo
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import report
 import plotly.graph_objs as go
 import pandas as pd
 
@@ -17,4 +19,4 @@ layout = go.Layout(
     title="Number of presses per timeslot"
 )
 fig = go.Figure(data=data, layout=layout)
-pyo.plot(fig, filename='button_presses2.html')
+report.plot(fig, filename='button_presses2.html')
@@ -3,20 +3,15 @@
 # is a continuous time series, and the y-axis sums
 # a frequency that is already part of the dataset
 ######
-import plotly.offline as pyo
 import plotly.graph_objs as go
-import pandas as pd
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared.rollups import fremont_rollups
+from shared import report
 
-df = pd.read_csv('../data/FremontBridgeBicycles.csv')
-
-# Convert the "Date" text column to a Datetime series:
-df['Date'] = pd.to_datetime(df['Date'])
-
-# Add a column to hold the hour:
-df['Hour']=df['Date'].dt.time
-
-# Let pandas perform the aggregation
-df2 = df.groupby('Hour').sum()
+# The rollup parses the "Date" column once with an explicit format
+# and keeps the per-hour totals, so there is no groupby to run here:
+df2 = fremont_rollups().by_hour()
 
 trace1 = go.Bar(
     x=df2.index,
@@ -37,4 +32,4 @@ layout = go.Layout(
     barmode='stack'
 )
 fig = go.Figure(data=data, layout=layout)
-pyo.plot(fig, filename='fremont_bridge.html')
+report.plot(fig, filename='fremont_bridge.html')
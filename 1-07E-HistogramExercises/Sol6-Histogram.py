@@ -5,7 +5,9 @@
 ######
 
 # Perform imports here:
-import plotly.offline as pyo
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import report
 import plotly.graph_objs as go
 import pandas as pd
 
@@ -25,4 +27,4 @@ layout = go.Layout(
 
 # create a fig from data & layout, and plot the fig
 fig = go.Figure(data=data, layout=layout)
-pyo.plot(fig, filename='solution6.html')
+report.plot(fig, filename='solution6.html')
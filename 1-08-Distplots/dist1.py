@@ -1,14 +1,17 @@
 #######
-# This distplot uses plotly's Figure Factory
-# module in place of Graph Objects
+# This distplot mirrors plotly's Figure Factory
+# create_distplot, with the histogram and KDE
+# computed by shared/density.py
 ######
-import plotly.offline as pyo
-import plotly.figure_factory as ff
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared.density import create_distplot
+from shared import report
 import numpy as np
 
 x = np.random.randn(1000)
 hist_data = [x]
 group_labels = ['distplot']
 
-fig = ff.create_distplot(hist_data, group_labels)
-pyo.plot(fig, filename='basic_distplot.html')
+fig = create_distplot(hist_data, group_labels)
+report.plot(fig, filename='basic_distplot.html')
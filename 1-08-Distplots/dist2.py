@@ -2,8 +2,10 @@
 # This distplot demonstrates that random samples
 # seldom fit a "normal" distribution.
 ######
-import plotly.offline as pyo
-import plotly.figure_factory as ff
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared.density import create_distplot
+from shared import report
 import numpy as np
 
 x1 = np.random.randn(200)-2
@@ -14,5 +16,5 @@ x4 = np.random.randn(200)+4
 hist_data = [x1,x2,x3,x4]
 group_labels = ['Group1','Group2','Group3','Group4']
 
-fig = ff.create_distplot(hist_data, group_labels)
-pyo.plot(fig, filename='multiset_distplot.html')
+fig = create_distplot(hist_data, group_labels)
+report.plot(fig, filename='multiset_distplot.html')
@@ -3,8 +3,10 @@
 # Quintus Curtius Snodgrass data and tries
 # to compare them.
 ######
-import plotly.offline as pyo
-import plotly.figure_factory as ff
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared.density import create_distplot
+from shared import report
 
 snodgrass = [.209,.205,.196,.210,.202,.207,.224,.223,.220,.201]
 twain = [.225,.262,.217,.240,.230,.229,.235,.217]
@@ -12,5 +14,5 @@ twain = [.225,.262,.217,.240,.230,.229,.235,.217]
 hist_data = [snodgrass,twain]
 group_labels = ['Snodgrass','Twain']
 
-fig = ff.create_distplot(hist_data, group_labels, bin_size=[.005,.005])
-pyo.plot(fig, filename='SnodgrassTwainDistplot.html')
+fig = create_distplot(hist_data, group_labels, bin_size=[.005,.005])
+report.plot(fig, filename='SnodgrassTwainDistplot.html')
@@ -7,8 +7,10 @@
 ######
 
 # Perform imports here:
-import plotly.offline as pyo
-import plotly.figure_factory as ff
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared.density import create_distplot
+from shared import report
 import pandas as pd
 
 # create a DataFrame from the .csv file:
@@ -24,8 +26,8 @@ hist_data = [trace0, trace1, trace2]
 group_labels = ['Iris Setosa','Iris Versicolor','Iris Virginica']
 
 # Create a fig from data and layout, and plot the fig
-fig = ff.create_distplot(hist_data, group_labels)
-pyo.plot(fig, filename='solution7.html')
+fig = create_distplot(hist_data, group_labels)
+report.plot(fig, filename='solution7.html')
 
 ########
 # Great! This shows that if given a flower with a petal length
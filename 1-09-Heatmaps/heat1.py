@@ -1,11 +1,12 @@
 #######
 # Heatmap of temperatures for Santa Barbara, California
 ######
-import plotly.offline as pyo
 import plotly.graph_objs as go
-import pandas as pd
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import datasets, report
 
-df = pd.read_csv('../data/2010SantaBarbaraCA.csv')
+df = datasets.read_csv('2010SantaBarbaraCA.csv')
 
 data = [go.Heatmap(
     x=df['DAY'],
@@ -19,4 +20,4 @@ layout = go.Layout(
     Santa Barbara, CA USA'
 )
 fig = go.Figure(data=data, layout=layout)
-pyo.plot(fig, filename='Santa_Barbara.html')
+report.plot(fig, filename='Santa_Barbara.html')
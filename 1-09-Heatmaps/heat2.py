@@ -1,11 +1,12 @@
 #######
 # Heatmap of temperatures for Yuma, Arizona
 ######
-import plotly.offline as pyo
 import plotly.graph_objs as go
-import pandas as pd
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import datasets, report
 
-df = pd.read_csv('../data/2010YumaAZ.csv')
+df = datasets.read_csv('2010YumaAZ.csv')
 
 data = [go.Heatmap(
     x=df['DAY'],
@@ -19,4 +20,4 @@ layout = go.Layout(
     Yuma, AZ USA'
 )
 fig = go.Figure(data=data, layout=layout)
-pyo.plot(fig, filename='Yuma.html')
+report.plot(fig, filename='Yuma.html')
@@ -3,14 +3,15 @@
 # Santa Barbara, California and Yuma, Arizona
 # using a shared temperature scale.
 ######
-import plotly.offline as pyo
 import plotly.graph_objs as go
 from plotly import tools
-import pandas as pd
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import datasets, report
 
-df1 = pd.read_csv('../data/2010SitkaAK.csv')
-df2 = pd.read_csv('../data/2010SantaBarbaraCA.csv')
-df3 = pd.read_csv('../data/2010YumaAZ.csv')
+df1 = datasets.read_csv('2010SitkaAK.csv')
+df2 = datasets.read_csv('2010SantaBarbaraCA.csv')
+df3 = datasets.read_csv('2010YumaAZ.csv')
 
 trace1 = go.Heatmap(
     x=df1['DAY'],
@@ -45,4 +46,4 @@ fig.append_trace(trace3, 1, 3)
 fig['layout'].update(      # access the layout directly!
     title='Hourly Temperatures, June 1-7, 2010'
 )
-pyo.plot(fig, filename='AllThree.html')
+report.plot(fig, filename='AllThree.html')
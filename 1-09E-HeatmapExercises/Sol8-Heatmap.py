@@ -8,7 +8,9 @@
 ######
 
 # Perform imports here:
-import plotly.offline as pyo
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import report
 import plotly.graph_objs as go
 import pandas as pd 
 # Create a DataFrame from  "flights" data
@@ -27,7 +29,7 @@ layout = go.Layout(
 )
 # Create a fig from data and layout, and plot the fig
 fig = go.Figure(data=data, layout=layout)
-pyo.plot(fig, filename='solution8.html')
+report.plot(fig, filename='solution8.html')
 
 #######
 # Excellent! This shows two distinct trends - an increase in
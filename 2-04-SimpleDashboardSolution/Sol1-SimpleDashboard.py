@@ -12,13 +12,15 @@ import dash
 import dash_core_components as dcc
 import dash_html_components as html
 import plotly.graph_objs as go
-import pandas as pd
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import datasets
 
 # Launch the application:
 app = dash.Dash()
 
 # Create a DataFrame from the .csv file:
-df = pd.read_csv('../data/OldFaithful.csv')
+df = datasets.read_csv('OldFaithful.csv')
 
 # Create a Dash layout that contains a Graph component:
 app.layout = html.Div([
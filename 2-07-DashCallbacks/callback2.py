@@ -2,12 +2,17 @@ import dash
 import dash_core_components as dcc
 import dash_html_components as html
 from dash.dependencies import Input, Output
+from dash.exceptions import PreventUpdate
 import plotly.graph_objs as go
-import pandas as pd
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import datasets, serializer
+from shared.figures import FigureCache
 
-df = pd.read_csv('../data/gapminderDataFiveYear.csv')
+df = datasets.read_csv('gapminderDataFiveYear.csv')
 
 app = dash.Dash()
+serializer.install()
 
 
 # https://dash.plot.ly/dash-core-components/dropdown
@@ -21,9 +26,7 @@ app.layout = html.Div([
     dcc.Dropdown(id='year-picker',options=year_options,value=df['year'].min())
 ])
 
-@app.callback(Output('graph', 'figure'),
-              [Input('year-picker', 'value')])
-def update_figure(selected_year):
+def build_figure(df, selected_year):
     filtered_df = df[df['year'] == selected_year]
     traces = []
     for continent_name in filtered_df['continent'].unique():
@@ -47,5 +50,23 @@ def update_figure(selected_year):
         )
     }
 
+# There are only 12 years, so each year's figure is built once and
+# reused. The cache starts over if the CSV file changes, and only
+# builds figures for years that are in the data.
+figures = FigureCache(
+    load=lambda: datasets.read_csv('gapminderDataFiveYear.csv'),
+    build=build_figure,
+    source=datasets.find_file('gapminderDataFiveYear.csv'),
+    keys=lambda df: df['year'].unique()
+)
+
+@app.callback(Output('graph', 'figure'),
+              [Input('year-picker', 'value')])
+def update_figure(selected_year):
+    try:
+        return figures.get(selected_year)
+    except KeyError:
+        raise PreventUpdate
+
 if __name__ == '__main__':
     app.run_server()
@@ -8,6 +8,9 @@ import dash_html_components as html
 from dash.dependencies import Input, Output
 import plotly.graph_objs as go
 import pandas as pd
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared.cube import IndicatorCube
 
 app = dash.Dash()
 
@@ -17,7 +20,11 @@ df = pd.read_csv(
     '8e0768211f6b747c0db42a9ce9a0937dafcbd8b2/'
     'indicators.csv')
 
-available_indicators = df['Indicator Name'].unique()
+# Pivot the table into a year x indicator x country array once;
+# each callback then takes two slices of it instead of filtering df:
+cube = IndicatorCube(df)
+
+available_indicators = cube.indicators
 
 app.layout = html.Div([
     html.Div([
@@ -73,12 +80,12 @@ app.layout = html.Div([
 def update_graph(xaxis_column_name, yaxis_column_name,
                  xaxis_type, yaxis_type,
                  year_value):
-    dff = df[df['Year'] == year_value]
+    x, y, countries = cube.pair(year_value, xaxis_column_name, yaxis_column_name)
     return {
         'data': [go.Scatter(
-            x=dff[dff['Indicator Name'] == xaxis_column_name]['Value'],
-            y=dff[dff['Indicator Name'] == yaxis_column_name]['Value'],
-            text=dff[dff['Indicator Name'] == yaxis_column_name]['Country Name'],
+            x=x,
+            y=y,
+            text=countries,
             mode='markers',
             marker={
                 'size': 15,
@@ -3,16 +3,23 @@ import dash_core_components as dcc
 import dash_html_components as html
 from dash.dependencies import Input, Output
 import plotly.graph_objs as go
-import pandas as pd
-import base64
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import datasets
+from shared.images import ImageAssets
+from shared.records import lookup_table
 
 app = dash.Dash()
 
-df = pd.read_csv('../data/wheels.csv')
+df = datasets.read_csv('wheels.csv')
 
-def encode_image(image_file):
-    encoded = base64.b64encode(open(image_file, 'rb').read())
-    return 'data:image/png;base64,{}'.format(encoded.decode())
+# Serve Data/Images from /images, so callbacks only return a URL
+# and the browser caches each picture:
+images = ImageAssets()
+images.register(app.server)
+
+# (wheels, color) -> image file name, built once:
+image_for = lookup_table(df, ['wheels', 'color'], 'image')
 
 app.layout = html.Div([
     html.Div([
@@ -52,9 +59,7 @@ app.layout = html.Div([
 def callback_image(clickData):
     wheel=clickData['points'][0]['y']
     color=clickData['points'][0]['x']
-    path = '../data/images/'
-    return encode_image(path+df[(df['wheels']==wheel) & \
-    (df['color']==color)]['image'].values[0])
+    return images.url(image_for[(wheel, color)])
 
 if __name__ == '__main__':
     app.run_server()
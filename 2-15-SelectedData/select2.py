@@ -10,6 +10,9 @@ from dash.dependencies import Input, Output
 import plotly.graph_objs as go
 import numpy as np
 import pandas as pd
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared.spatial import GridIndex
 
 app = dash.Dash()
 
@@ -27,6 +30,10 @@ df3 = pd.DataFrame({'x': x2, 'y': y})
 # combine them into one DataFrame (df1 and df2 points overlap!)
 df = pd.concat([df1,df2,df3])
 
+# Index the plotted points once, so a selection can be counted
+# from its outline alone:
+points = GridIndex(df['x'], df['y'])
+
 app.layout = html.Div([
     html.Div([
     dcc.Graph(
@@ -48,21 +55,42 @@ app.layout = html.Div([
 
     html.Div([
     html.H1(id='density', style={'paddingTop':25})
-    ], style={'width':'30%', 'display':'inline-block', 'verticalAlign':'top'})
+    ], style={'width':'30%', 'display':'inline-block', 'verticalAlign':'top'}),
+
+    # holds just the outline of the current selection
+    dcc.Store(id='selection')
 ])
 
+# This runs in the browser: it keeps the box range or lasso outline
+# and drops the list of selected points, so they are never uploaded.
+app.clientside_callback(
+    """
+    function(selectedData) {
+        if (!selectedData) {
+            return null;
+        }
+        return {range: selectedData.range, lassoPoints: selectedData.lassoPoints};
+    }
+    """,
+    Output('selection', 'data'),
+    [Input('plot', 'selectedData')])
+
 @app.callback(
     Output('density', 'children'),
-    [Input('plot', 'selectedData')])
-def find_density(selectedData):
-    pts = len(selectedData['points'])
-    rng_or_lp = list(selectedData.keys())
-    rng_or_lp.remove('points')
-    max_x = max(selectedData[rng_or_lp[0]]['x'])
-    min_x = min(selectedData[rng_or_lp[0]]['x'])
-    max_y = max(selectedData[rng_or_lp[0]]['y'])
-    min_y = min(selectedData[rng_or_lp[0]]['y'])
+    [Input('selection', 'data')])
+def find_density(selection):
+    if not selection:
+        return ''
+    pts = points.count_selection(selection)
+    rng_or_lp = selection.get('range') or selection['lassoPoints']
+    max_x = max(rng_or_lp['x'])
+    min_x = min(rng_or_lp['x'])
+    max_y = max(rng_or_lp['y'])
+    min_y = min(rng_or_lp['y'])
     area = (max_x-min_x)*(max_y-min_y)
+    if not area:
+        # a box or lasso with no width or height
+        return ''
     d = pts/area
     return 'Density = {:.2f}'.format(d)
 
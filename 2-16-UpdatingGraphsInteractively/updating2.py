@@ -7,12 +7,15 @@ import dash_core_components as dcc
 import dash_html_components as html
 from dash.dependencies import Input, Output
 import plotly.graph_objs as go
-import pandas as pd
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import datasets, serializer
 from numpy import random
 
 app = dash.Dash()
+serializer.install()
 
-df = pd.read_csv('../data/mpg.csv')
+df = datasets.read_csv('mpg.csv')
 
 # Add a random "jitter" to model_year to spread out the plot
 df['year'] = df['model_year'] + random.randint(-4,5,len(df))*0.10
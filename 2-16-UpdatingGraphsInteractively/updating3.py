@@ -1,23 +1,30 @@
 #######
 # This shows the mpg.csv dataset as a spread out scatter plot
-# that sends hoverData to another graph via callback, and to
-# a Markdown component through a second callback.
+# that sends hoverData to another graph and to a Markdown
+# component through a single callback.
 ######
 import dash
 import dash_core_components as dcc
 import dash_html_components as html
 from dash.dependencies import Input, Output
 import plotly.graph_objs as go
-import pandas as pd
 from numpy import random
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import datasets
+from shared.records import RecordStore
 
 app = dash.Dash()
 
-df = pd.read_csv('../data/mpg.csv')
+df = datasets.read_csv('mpg.csv')
 
 # Add a random "jitter" to model_year to spread out the plot
 df['year'] = df['model_year'] + random.randint(-4,5,len(df))*0.10
 
+# Copy the columns the hover callback needs into plain lists once,
+# so each hover event is a list lookup instead of a df.iloc call:
+cars = RecordStore(df, ['name', 'cylinders', 'displacement', 'acceleration'])
+
 app.layout = html.Div([
     html.Div([   # this Div contains our scatter plot
     dcc.Graph(
@@ -60,40 +67,35 @@ app.layout = html.Div([
 ])
 
 @app.callback(
-    Output('mpg_line', 'figure'),
+    [Output('mpg_line', 'figure'),
+     Output('mpg_stats', 'children')],
     [Input('mpg_scatter', 'hoverData')])
-def callback_graph(hoverData):
-    v_index = hoverData['points'][0]['pointIndex']
+def callback_hover(hoverData):
+    car = cars.row(hoverData['points'][0]['pointIndex'])
     fig = {
-        'data': [go.Scatter(
-            x = [0,1],
-            y = [0,60/df.iloc[v_index]['acceleration']],
-            mode='lines',
-            line={'width':2*df.iloc[v_index]['cylinders']}
-        )],
-        'layout': go.Layout(
-            title = df.iloc[v_index]['name'],
-            xaxis = {'visible':False},
-            yaxis = {'visible':False, 'range':[0,60/df['acceleration'].min()]},
-            margin = {'l':0},
-            height = 300
-        )
+        'data': [{
+            'type': 'scatter',
+            'x': [0,1],
+            'y': [0,60/car['acceleration']],
+            'mode': 'lines',
+            'line': {'width':2*car['cylinders']}
+        }],
+        'layout': {
+            'title': car['name'],
+            'xaxis': {'visible':False},
+            'yaxis': {'visible':False, 'range':[0,60/cars.min('acceleration')]},
+            'margin': {'l':0},
+            'height': 300
+        }
     }
-    return fig
-
-@app.callback(
-    Output('mpg_stats', 'children'),
-    [Input('mpg_scatter', 'hoverData')])
-def callback_stats(hoverData):
-    v_index = hoverData['points'][0]['pointIndex']
     stats = """
         {} cylinders
         {}cc displacement
         0 to 60mph in {} seconds
-        """.format(df.iloc[v_index]['cylinders'],
-            df.iloc[v_index]['displacement'],
-            df.iloc[v_index]['acceleration'])
-    return stats
+        """.format(car['cylinders'],
+            car['displacement'],
+            car['acceleration'])
+    return fig, stats
 
 if __name__ == '__main__':
     app.run_server()
@@ -0,0 +1,64 @@
+#######
+# This plots every hour of the Fremont Bridge bicycle counts, about
+# 47,000 points per sidewalk, and redraws the graph whenever the user
+# zooms, pans or resets it (its relayoutData).
+# Each trace is sent with at most 2000 points: the whole series is thinned
+# with LTTB, and a zoomed-in range is sent again at full resolution as
+# soon as it holds fewer points than that.
+######
+import dash
+import dash_core_components as dcc
+import dash_html_components as html
+from dash.dependencies import Input, Output
+from dash.exceptions import PreventUpdate
+import plotly.graph_objs as go
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import serializer, typedarrays
+from shared.downsample import Downsampler, relayout_range
+from shared.rollups import fremont_rollups
+
+app = dash.Dash()
+serializer.install()
+
+POINT_BUDGET = 2000
+
+# The full-resolution series stay on the server, one per trace:
+hourly = fremont_rollups().hourly()
+series = {
+    column.replace('Fremont Bridge ', ''): Downsampler(
+        hourly.index.values, hourly[column].values, budget=POINT_BUDGET)
+    for column in hourly.columns
+}
+
+def make_figure(start=None, end=None):
+    data = []
+    for name, sampler in series.items():
+        x, y = sampler.window(start, end)
+        data.append(go.Scatter(x=x, y=y, mode='lines', name=name))
+    xaxis = {'title': 'Date'}
+    if start is not None:
+        xaxis['range'] = [start, end]
+    layout = go.Layout(
+        title='Fremont Bridge Bicycle Traffic by Hour',
+        xaxis=xaxis,
+        yaxis={'title': 'Bicycles per hour'},
+        hovermode='closest'
+    )
+    return typedarrays.encode(go.Figure(data=data, layout=layout))
+
+app.layout = html.Div([
+    dcc.Graph(id='fremont-graph', figure=make_figure())
+])
+
+@app.callback(Output('fremont-graph', 'figure'),
+              [Input('fremont-graph', 'relayoutData')])
+def zoom_graph(relayoutData):
+    window = relayout_range(relayoutData)
+    if window is None:
+        # e.g. the first load, or a zoom on the y axis only
+        raise PreventUpdate
+    return make_figure(*window)
+
+if __name__ == '__main__':
+    app.run_server()
@@ -11,17 +11,27 @@ import dash
 import dash_core_components as dcc
 import dash_html_components as html
 from dash.dependencies import Input, Output, State
-import pandas_datareader.data as web # requires v0.6.0 or later
 from datetime import datetime
-import pandas as pd
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import datasets, serializer
+from shared.options import OptionIndex
+from shared.prices import PriceService
 
 app = dash.Dash()
+serializer.install()
 
-nsdq = pd.read_csv('../data/NASDAQcompanylist.csv')
+# Fetches the selected tickers in parallel through pandas_datareader
+# (v0.6.0 or later) and keeps them on disk, so a refresh only asks
+# IEX for the days it hasn't seen yet. Only symbols from the list
+# are ever looked up:
+nsdq = datasets.read_csv('NASDAQcompanylist.csv')
 nsdq.set_index('Symbol', inplace=True)
-options = []
-for tic in nsdq.index:
-    options.append({'label':'{} {}'.format(tic,nsdq.loc[tic]['Name']), 'value':tic})
+prices = PriceService(symbols=nsdq.index)
+# Builds every '<symbol> <name>' label in one pass. Only the selected
+# symbols go into the layout; the rest are found as the user types:
+symbols = OptionIndex.from_frame(nsdq, ['Symbol', 'Name'], 'Symbol')
+symbols.register_callback(app, 'my_ticker_symbol')
 
 app.layout = html.Div([
     html.H1('Stock Ticker Dashboard'),
@@ -29,7 +39,7 @@ app.layout = html.Div([
         html.H3('Select stock symbols:', style={'paddingRight':'30px'}),
         dcc.Dropdown(
             id='my_ticker_symbol',
-            options=options,
+            options=symbols.selected(['TSLA']),
             value=['TSLA'],
             multi=True
         )
@@ -70,9 +80,10 @@ app.layout = html.Div([
 def update_graph(n_clicks, stock_ticker, start_date, end_date):
     start = datetime.strptime(start_date[:10], '%Y-%m-%d')
     end = datetime.strptime(end_date[:10], '%Y-%m-%d')
+    # an empty list once the dropdown is cleared
+    stock_ticker = prices.known(stock_ticker or [])
     traces = []
-    for tic in stock_ticker:
-        df = web.DataReader(tic,'iex',start,end)
+    for tic, df in prices.histories(stock_ticker, start, end).items():
         traces.append({'x':df.index, 'y': df.close, 'name':tic})
     fig = {
         'data': traces,
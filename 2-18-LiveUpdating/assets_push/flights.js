@@ -0,0 +1,36 @@
+// Subscribes to the /events/flights stream served by liveupdating4.py and
+// draws each sample straight onto the page, with no Dash callback involved.
+(function () {
+    var MAX_POINTS = 1000;
+    var lastId = 0;
+    var pending = [];
+
+    function flush() {
+        var graph = document.querySelector('#live-update-graph .js-plotly-plot');
+        if (!graph || !window.Plotly) {
+            // the Dash layout hasn't rendered yet; try again shortly
+            setTimeout(flush, 250);
+            return;
+        }
+        if (!pending.length) {
+            return;
+        }
+        var xs = pending.map(function (s) { return s.x; });
+        var ys = pending.map(function (s) { return s.y; });
+        pending = [];
+        Plotly.extendTraces(graph, {x: [xs], y: [ys]}, [0], MAX_POINTS);
+        document.getElementById('counter_text').textContent =
+            'Active flights worldwide: ' + ys[ys.length - 1];
+    }
+
+    var source = new EventSource('/events/flights');
+    source.onmessage = function (event) {
+        var id = parseInt(event.lastEventId, 10);
+        if (id <= lastId) {
+            return;  // a replay after reconnecting can repeat a sample
+        }
+        lastId = id;
+        pending.push(JSON.parse(event.data));
+        flush();
+    };
+})();
@@ -8,9 +8,28 @@ import dash_core_components as dcc
 import dash_html_components as html
 from dash.dependencies import Input, Output
 import requests
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared.live import Poller, RingBuffer
 
 app = dash.Dash()
 
+def fetch_flight_count():
+    url = "https://data-live.flightradar24.com/zones/fcgi/feed.js?faa=1\
+           &mlat=1&flarm=1&adsb=1&gnd=1&air=1&vehicles=1&estimated=1&stats=1"
+    # A fake header is necessary to access the site:
+    res = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=10)
+    data = res.json()
+    counter = 0
+    for element in data["stats"]["total"]:
+        counter += data["stats"]["total"][element]
+    return counter
+
+# One background thread polls the API for every viewer; the callback
+# only reads the latest count instead of making a request of its own:
+counts = RingBuffer(capacity=1)
+poller = Poller(fetch_flight_count, interval=6, buffer=counts).start()
+
 app.layout = html.Div([
     html.Div([
         html.Iframe(src = 'https://www.flightradar24.com', height = 500, width = 1200)
@@ -31,15 +50,10 @@ app.layout = html.Div([
 @app.callback(Output('counter_text', 'children'),
               [Input('interval-component', 'n_intervals')])
 def update_layout(n):
-    url = "https://data-live.flightradar24.com/zones/fcgi/feed.js?faa=1\
-           &mlat=1&flarm=1&adsb=1&gnd=1&air=1&vehicles=1&estimated=1&stats=1"
-    # A fake header is necessary to access the site:
-    res = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'})
-    data = res.json()
-    counter = 0
-    for element in data["stats"]["total"]:
-        counter += data["stats"]["total"][element]
-    return 'Active flights worldwide: {}'.format(counter)
+    latest = counts.latest()
+    if latest is None:
+        return 'Active flights worldwide:'
+    return 'Active flights worldwide: {}'.format(int(latest[1]))
 
 if __name__ == '__main__':
     app.run_server()
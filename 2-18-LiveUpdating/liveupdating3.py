@@ -3,15 +3,53 @@
 # to obtain updated total worldwide flights data.
 # ** This version continuously updates the number of flights worldwide,
 #    AND GRAPHS THOSE RESULTS OVER TIME! **
+# A day of samples is kept, but the graph gets at most 2000 points of it
+# at a time; zooming in redraws the visible range at full resolution,
+# and new samples wait until the zoom is reset.
 ######
 import dash
 import dash_core_components as dcc
 import dash_html_components as html
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, State
+from dash.exceptions import PreventUpdate
 import plotly.graph_objs as go
 import requests
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared import serializer, typedarrays
+from shared.downsample import Downsampler, relayout_range
+from shared.live import Poller, RingBuffer, extend_data
 
 app = dash.Dash()
+serializer.install()
+
+def fetch_flight_count():
+    url = "https://data-live.flightradar24.com/zones/fcgi/feed.js?faa=1\
+           &mlat=1&flarm=1&adsb=1&gnd=1&air=1&vehicles=1&estimated=1&stats=1"
+    # A fake header is necessary to access the site:
+    res = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=10)
+    data = res.json()
+    counter = 0
+    for element in data["stats"]["total"]:
+        counter += data["stats"]["total"][element]
+    return counter
+
+# One background thread polls the API for every viewer, and keeps the
+# last 14400 samples (a day) in a fixed-size buffer:
+counts = RingBuffer(capacity=14400)
+poller = Poller(fetch_flight_count, interval=6, buffer=counts).start()
+
+POINT_BUDGET = 2000
+
+def make_figure(start=None, end=None):
+    # the buffered samples in the given range, thinned to POINT_BUDGET
+    seqs, times, values = counts.since(0)
+    x, y = Downsampler(times, values, budget=POINT_BUDGET).window(start, end)
+    layout = {}
+    if start is not None:
+        layout['xaxis'] = {'range': [start, end]}
+    return typedarrays.encode(go.Figure(
+        data=[go.Scatter(x=x, y=y, mode='lines+markers')], layout=layout))
 
 app.layout = html.Div([
     html.Div([
@@ -23,39 +61,63 @@ app.layout = html.Div([
         id='counter_text',
         children='Active flights worldwide:'
     ),
-    dcc.Graph(id='live-update-graph',style={'width':1200}),
+    dcc.Graph(
+        id='live-update-graph',
+        style={'width':1200},
+        # start with an empty trace; callbacks only append new points to it
+        figure=go.Figure(data=[go.Scatter(x=[], y=[], mode='lines+markers')])
+    ),
+    # the sequence number of the last sample this browser has received
+    dcc.Store(id='last-seq', data=0),
+    # the zoomed-in x range, or None while the whole history is shown
+    dcc.Store(id='zoom', data=None),
     dcc.Interval(
         id='interval-component',
         interval=6000, # 6000 milliseconds = 6 seconds
         n_intervals=0
     )])
 ])
-counter_list = []
 
 @app.callback(Output('counter_text', 'children'),
               [Input('interval-component', 'n_intervals')])
 def update_layout(n):
-    url = "https://data-live.flightradar24.com/zones/fcgi/feed.js?faa=1\
-           &mlat=1&flarm=1&adsb=1&gnd=1&air=1&vehicles=1&estimated=1&stats=1"
-    # A fake header is necessary to access the site:
-    res = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'})
-    data = res.json()
-    counter = 0
-    for element in data["stats"]["total"]:
-        counter += data["stats"]["total"][element]
-    counter_list.append(counter)
-    return 'Active flights worldwide: {}'.format(counter)
+    latest = counts.latest()
+    if latest is None:
+        return 'Active flights worldwide:'
+    return 'Active flights worldwide: {}'.format(int(latest[1]))
 
-@app.callback(Output('live-update-graph','figure'),
-              [Input('interval-component', 'n_intervals')])
-def update_graph(n):
-    fig = go.Figure(
-        data = [go.Scatter(
-        x = list(range(len(counter_list))),
-        y = counter_list,
-        mode='lines+markers'
-        )])
-    return fig
+@app.callback([Output('live-update-graph', 'figure'),
+               Output('live-update-graph','extendData'),
+               Output('last-seq', 'data'),
+               Output('zoom', 'data')],
+              [Input('interval-component', 'n_intervals'),
+               Input('live-update-graph', 'relayoutData')],
+              [State('last-seq', 'data'),
+               State('zoom', 'data')])
+def update_graph(n, relayoutData, last_seq, zoom):
+    triggered = [t['prop_id'] for t in dash.callback_context.triggered]
+    if 'live-update-graph.relayoutData' in triggered:
+        window = relayout_range(relayoutData)
+        if window is None:
+            raise PreventUpdate
+        # zoomed, panned or reset: redraw that range from the buffer
+        zoom = None if window[0] is None else list(window)
+        return make_figure(*window), dash.no_update, counts.last_seq, zoom
+    if zoom:
+        # appending "now" to the zoomed-in trace would draw a line from
+        # the edge of the window to the present; catch up after a reset
+        raise PreventUpdate
+    if not last_seq:
+        if not counts.last_seq:
+            raise PreventUpdate  # nothing fetched yet
+        # a new page starts from the whole (thinned) history
+        return make_figure(), dash.no_update, counts.last_seq, None
+    # otherwise send only the samples this browser hasn't seen yet,
+    # and keep the trace at most twice the budget long
+    extend, seq = extend_data(counts, last_seq, max_points=2 * POINT_BUDGET)
+    if extend is None:
+        raise PreventUpdate
+    return dash.no_update, extend, seq, dash.no_update
 
 if __name__ == '__main__':
     app.run_server()
@@ -0,0 +1,70 @@
+#######
+# This script will make regular API calls to http://data-live.flightradar24.com
+# to obtain updated total worldwide flights data.
+# ** This version PUSHES each new result to the browser as it arrives,
+#    instead of every browser polling the server with dcc.Interval! **
+# The page listens to a server-sent events (SSE) stream at /events/flights;
+# see assets_push/flights.js for the browser side.
+######
+import dash
+import dash_core_components as dcc
+import dash_html_components as html
+import plotly.graph_objs as go
+import requests
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared.live import Poller, RingBuffer, samples_since
+from shared.push import Publisher, register_sse
+
+# assets_push/ holds the JavaScript that subscribes to the stream:
+app = dash.Dash(__name__, assets_folder='assets_push')
+
+def fetch_flight_count():
+    url = "https://data-live.flightradar24.com/zones/fcgi/feed.js?faa=1\
+           &mlat=1&flarm=1&adsb=1&gnd=1&air=1&vehicles=1&estimated=1&stats=1"
+    # A fake header is necessary to access the site:
+    res = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=10)
+    data = res.json()
+    counter = 0
+    for element in data["stats"]["total"]:
+        counter += data["stats"]["total"][element]
+    return counter
+
+counts = RingBuffer(capacity=1000)
+poller = Poller(fetch_flight_count, interval=6, buffer=counts)
+
+# Every new sample is published once, to every open page:
+publisher = Publisher()
+def publish_sample(seq, value):
+    for seq, sample in samples_since(counts, seq - 1):
+        publisher.publish('flights', sample, id=seq)
+
+poller.subscribe(publish_sample)
+
+# A page that (re)connects first gets the samples it hasn't seen:
+def replay(topic, last_id):
+    return samples_since(counts, last_id)
+
+register_sse(app.server, publisher, replay=replay)
+poller.start()
+
+app.layout = html.Div([
+    html.Div([
+        html.Iframe(src = 'https://www.flightradar24.com', height = 500, width = 1200)
+    ]),
+
+    html.Div([
+    html.Pre(
+        id='counter_text',
+        children='Active flights worldwide:'
+    ),
+    # No dcc.Interval: flights.js extends this graph as samples arrive
+    dcc.Graph(
+        id='live-update-graph',
+        style={'width':1200},
+        figure=go.Figure(data=[go.Scatter(x=[], y=[], mode='lines+markers')])
+    )])
+])
+
+if __name__ == '__main__':
+    app.run_server()
@@ -1,15 +1,22 @@
 import dash
-import dash_auth
 import dash_core_components as dcc
 import dash_html_components as html
 from dash.dependencies import Input, Output
+import sys
+sys.path.append('..')  # makes the shared/ helpers importable
+from shared.auth import CredentialStore, SessionAuth
 
 USERNAME_PASSWORD_PAIRS = [
     ['JamesBond', '007'],['LouisArmstrong', 'satchmo']
 ]
 
 app = dash.Dash()
-auth = dash_auth.BasicAuth(app,USERNAME_PASSWORD_PAIRS)
+# Works like dash_auth.BasicAuth(app,USERNAME_PASSWORD_PAIRS), but only
+# salted hashes of the passwords are kept, and after one login the browser
+# is let in by a signed session cookie instead of a password check on every
+# request. For many users, load the hashes from a file instead:
+# CredentialStore.from_file('users.txt')
+auth = SessionAuth(app, CredentialStore.from_pairs(USERNAME_PASSWORD_PAIRS))
 
 app.layout = html.Div([
     dcc.RangeSlider(
@@ -0,0 +1,93 @@
+"""
+Compare plotly.figure_factory.create_distplot with shared/density.py.
+
+For each sample size the same distplot (histogram + KDE curve, no rug) is
+built three ways:
+
+  figure_factory: ff.create_distplot. Newer plotly releases dropped it; in
+                  that case the same work is done directly: scipy's
+                  gaussian_kde at 500 points plus a histogram trace
+                  holding every sample.
+  density cold:   building a Density and calling
+                  shared.density.create_distplot on it.
+  density cached: the same call again on that Density (what a callback
+                  whose inputs come back to earlier values pays).
+
+Figure size is the length of the serialized figure sent to the browser.
+Run from the repo root:
+
+    python benchmarks/distplot.py --sizes 1000 100000 10000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import plotly.figure_factory as ff
+import plotly.graph_objs as go
+from scipy import stats
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.density import Density, create_distplot  # noqa: E402
+from shared.figures import to_json  # noqa: E402
+
+BIN_SIZE = 0.1
+
+
+def reference_distplot(values):
+    """What figure_factory's create_distplot does for one histogram + KDE."""
+    if hasattr(ff, 'create_distplot'):
+        return ff.create_distplot([values], ['x'], bin_size=BIN_SIZE,
+                                  show_rug=False)
+    start, end = values.min(), values.max()
+    curve_x = [start + i * (end - start) / 500 for i in range(500)]
+    curve_y = stats.gaussian_kde(values)(curve_x)
+    return go.Figure(data=[
+        go.Histogram(x=values, histnorm='probability density', autobinx=False,
+                     xbins=dict(start=start, end=end, size=BIN_SIZE),
+                     opacity=0.7),
+        go.Scatter(x=curve_x, y=curve_y, mode='lines'),
+    ])
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[1000, 100000, 10000000])
+    parser.add_argument('--no-reference-above', type=int, default=None,
+                        help='skip figure_factory for larger samples')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print('{:>10}  {:<16}{:>10}  {:>12}'.format('samples', '', 'time', 'figure'))
+    for n in args.sizes:
+        values = rng.standard_normal(n)
+        runs = []
+        if args.no_reference_above is None or n <= args.no_reference_above:
+            runs.append(('figure_factory', lambda: reference_distplot(values)))
+        densities = []
+
+        def make():
+            if not densities:
+                densities.append(Density(values))
+            return create_distplot(densities, ['x'], bin_size=BIN_SIZE,
+                                   show_rug=False)
+
+        runs += [('density cold', make), ('density cached', make)]
+
+        for name, run in runs:
+            seconds, fig = timed(run)
+            print('{:>10}  {:<16}{:>9.4f}s  {:>10.1f}kB'.format(
+                n, name, seconds, len(to_json(fig)) / 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+"""
+Count the callback requests the multi-page apps make per navigation.
+
+The Dash renderer sends one POST to /_dash-update-component for every
+callback an event triggers, and then one for every callback triggered by
+those callbacks' outputs, and so on. This script loads each app, replays
+that process against the app's Flask server with a test client, and
+reports the number of requests and the server time they took for
+
+  load:      the first page load (every callback fires once)
+  navigate:  following a link to another page
+  click:     clicking a submenu header (sidebar-with-submenus only)
+
+``--rev`` runs the apps as they were at an earlier revision instead, e.g.
+to compare with the version before shared/router.py. Run from the repo
+root:
+
+    python benchmarks/navigation_requests.py
+    python benchmarks/navigation_requests.py --rev HEAD~1
+"""
+import argparse
+import json
+import os
+import runpy
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+APPS = {
+    'navbar.py': ['/page-2'],
+    'simple_sidebar.py': ['/page-2'],
+    'responsive-sidebar/sidebar.py': ['/page-2'],
+    'responsive-collapsible-sidebar/sidebar.py': ['/page-2'],
+    'sidebar-with-submenus/sidebar.py': ['/page-2/1', 'submenu-1'],
+}
+
+
+def parse_outputs(spec):
+    """'..a.b...c.d..' or 'a.b' -> ['a.b', 'c.d']"""
+    if spec.startswith('..'):
+        return spec[2:-2].split('...')
+    return [spec]
+
+
+def load_app(path):
+    """Import an app script from its own directory, as `python app.py` would."""
+    directory, script = os.path.split(os.path.abspath(path))
+    cwd, sys_path = os.getcwd(), list(sys.path)
+    os.chdir(directory)
+    sys.path.insert(0, directory)
+    for name in [m for m in sys.modules if m == 'pages' or m.startswith('pages.')
+                 or m == 'shared' or m.startswith('shared.')]:
+        del sys.modules[name]
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            return runpy.run_path(script, run_name='benchmark')['app']
+    finally:
+        os.chdir(cwd)
+        sys.path[:] = sys_path
+
+
+class Renderer:
+    """Just enough of the Dash renderer to replay callback chains."""
+
+    def __init__(self, app):
+        self.client = app.server.test_client()
+        self.callbacks = [
+            dict(cb, outputs=parse_outputs(cb['output']))
+            for cb in app._callback_list
+        ]
+        self.props = {}
+        self.requests = 0
+        self.seconds = 0.0
+
+    def _fire(self, cb, changed):
+        def values(deps):
+            return [dict(d, value=self.props.get('{id}.{property}'.format(**d)))
+                    for d in deps]
+
+        outputs = [dict(zip(('id', 'property'), o.rsplit('.', 1)))
+                   for o in cb['outputs']]
+        payload = {
+            'output': cb['output'],
+            'outputs': outputs if cb['output'].startswith('..') else outputs[0],
+            'inputs': values(cb['inputs']),
+            'state': values(cb['state']),
+            'changedPropIds': sorted(changed),
+        }
+        start = time.perf_counter()
+        response = self.client.post('/_dash-update-component',
+                                    data=json.dumps(payload),
+                                    content_type='application/json')
+        self.seconds += time.perf_counter() - start
+        self.requests += 1
+        if response.status_code == 204:
+            return set()
+        updated = set()
+        for id_, props in json.loads(response.data)['response'].items():
+            for prop, value in props.items():
+                self.props['{}.{}'.format(id_, prop)] = value
+                updated.add('{}.{}'.format(id_, prop))
+        return updated
+
+    def _inputs(self, cb):
+        return {'{id}.{property}'.format(**d) for d in cb['inputs']}
+
+    def event(self, changed, initial=False):
+        """Fire everything ``changed`` props trigger; returns (requests, ms)."""
+        self.requests, self.seconds = 0, 0.0
+        fired = []
+        if initial:
+            # every callback fires once, those fed by other callbacks last
+            produced = {o for cb in self.callbacks for o in cb['outputs']}
+            queue = sorted(self.callbacks,
+                           key=lambda cb: bool(self._inputs(cb) & produced))
+            for cb in queue:
+                # nothing has "changed" on a first load
+                self._fire(cb, set())
+            return self.requests, self.seconds * 1000
+        while changed:
+            ready = [cb for cb in self.callbacks
+                     if cb not in fired and self._inputs(cb) & changed]
+            updated = set()
+            for cb in ready:
+                fired.append(cb)
+                updated |= self._fire(cb, self._inputs(cb) & changed)
+            changed = updated
+        return self.requests, self.seconds * 1000
+
+
+def run(apps_dir, repeat):
+    print('{:<44}{:<22}{:>9}{:>12}'.format('app', 'event', 'requests',
+                                          'server ms'))
+    for script, events in APPS.items():
+        renderer = Renderer(load_app(os.path.join(apps_dir, script)))
+        renderer.props['url.pathname'] = '/'
+        rows = [('load', renderer.event(set(), initial=True))]
+        for event in events * repeat:
+            if event.startswith('/'):
+                renderer.props['url.pathname'] = event
+                changed = {'url.pathname'}
+                # go back home so the next repeat is a real navigation too
+                result = renderer.event(changed)
+                renderer.props['url.pathname'] = '/'
+                renderer.event(changed)
+                rows.append(('navigate ' + event, result))
+            else:
+                key = event + '.n_clicks'
+                renderer.props[key] = (renderer.props.get(key) or 0) + 1
+                rows.append(('click ' + event, renderer.event({key})))
+        seen = {}
+        for name, (requests, ms) in rows:
+            seen.setdefault(name, []).append((requests, ms))
+        for name, results in seen.items():
+            print('{:<44}{:<22}{:>9}{:>12.2f}'.format(
+                script, name, results[0][0],
+                sum(ms for _, ms in results) / len(results)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rev', help='git revision to take the apps from')
+    parser.add_argument('--repeat', type=int, default=20,
+                        help='navigations per app to average the time over')
+    args = parser.parse_args()
+
+    if args.rev is None:
+        run(os.path.join(ROOT_DIR, 'dbc_examples', 'multi-page-apps'),
+            args.repeat)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = subprocess.run(
+            ['git', 'archive', args.rev, 'dbc_examples/multi-page-apps',
+             'shared'],
+            cwd=ROOT_DIR, check=True, stdout=subprocess.PIPE,
+        ).stdout
+        subprocess.run(['tar', '-x', '-C', tmp], input=archive, check=True)
+        run(os.path.join(tmp, 'dbc_examples', 'multi-page-apps'), args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""
+Compare dcc.Interval-style polling with the SSE push channel in
+shared/push.py for a live page like 2-18-LiveUpdating/liveupdating3.py.
+
+A small Flask server runs in a child process. A background thread adds a
+sample to a RingBuffer every --change-period seconds. Then --viewers
+simulated browsers either
+
+  poll:  send the two requests liveupdating3 makes per dcc.Interval tick
+         (counter text + graph update) every --interval seconds, or
+  push:  hold one /events/flights stream open and read what arrives.
+
+The server reports how many HTTP requests it handled and how much CPU
+time it used. Run from the repo root:
+
+    python benchmarks/push_vs_polling.py --viewers 50 --duration 10
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.live import RingBuffer, extend_data, samples_since  # noqa: E402
+from shared.push import Publisher, register_sse  # noqa: E402
+
+
+def serve(port, change_period, ready):
+    from flask import Flask, jsonify, request
+    from werkzeug.serving import make_server
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+
+    server = Flask(__name__)
+    counts = RingBuffer(capacity=1000)
+    publisher = Publisher()
+    handled = [0]
+
+    @server.before_request
+    def count_request():
+        handled[0] += 1
+
+    @server.route('/poll/text')
+    def poll_text():
+        latest = counts.latest()
+        return jsonify('Active flights worldwide: {}'.format(
+            int(latest[1]) if latest else ''))
+
+    @server.route('/poll/graph')
+    def poll_graph():
+        extend, seq = extend_data(
+            counts, request.args.get('seq', 0, type=int), 1000)
+        return jsonify({'extend': extend, 'seq': seq})
+
+    @server.route('/stats')
+    def stats():
+        return jsonify({'requests': handled[0], 'cpu': time.process_time()})
+
+    register_sse(server, publisher, heartbeat=1,
+                 replay=lambda topic, last: samples_since(counts, last))
+
+    def produce():
+        value = 10000
+        while True:
+            value += 1
+            seq = counts.append(value)
+            for seq, sample in samples_since(counts, seq - 1):
+                publisher.publish('flights', sample, id=seq)
+            time.sleep(change_period)
+
+    threading.Thread(target=produce, daemon=True).start()
+    httpd = make_server('127.0.0.1', port, server, threaded=True)
+    ready.set()
+    httpd.serve_forever()
+
+
+def get_json(url):
+    with urllib.request.urlopen(url) as response:
+        return json.loads(response.read())
+
+
+def poll_viewer(base, interval, stop):
+    seq = 0
+    while not stop.is_set():
+        get_json(base + '/poll/text')
+        seq = get_json(base + '/poll/graph?seq={}'.format(seq))['seq'] or seq
+        stop.wait(interval)
+
+
+def push_viewer(base, stop, received):
+    with urllib.request.urlopen(base + '/events/flights') as response:
+        for line in response:
+            if line.startswith(b'data:'):
+                received.append(1)
+            if stop.is_set():
+                return
+
+
+def run(mode, viewers, interval, change_period, duration, port):
+    ready = multiprocessing.Event()
+    server = multiprocessing.Process(
+        target=serve, args=(port, change_period, ready), daemon=True)
+    server.start()
+    ready.wait()
+    base = 'http://127.0.0.1:{}'.format(port)
+    before = get_json(base + '/stats')
+
+    stop = threading.Event()
+    received = []
+    if mode == 'poll':
+        threads = [threading.Thread(target=poll_viewer, args=(base, interval, stop))
+                   for _ in range(viewers)]
+    else:
+        threads = [threading.Thread(target=push_viewer, args=(base, stop, received))
+                   for _ in range(viewers)]
+    for t in threads:
+        t.daemon = True
+        t.start()
+    time.sleep(duration)
+    stop.set()
+    after = get_json(base + '/stats')
+    server.terminate()
+
+    # the /stats calls themselves are not part of the workload
+    requests = after['requests'] - before['requests'] - 1
+    return {
+        'mode': mode,
+        'requests': requests,
+        'requests/s': requests / duration,
+        'server cpu s': after['cpu'] - before['cpu'],
+        'messages': len(received) if mode == 'push' else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--viewers', type=int, default=50)
+    parser.add_argument('--interval', type=float, default=1.0,
+                        help='dcc.Interval period of the polling pages (s)')
+    parser.add_argument('--change-period', type=float, default=1.0,
+                        help='how often the data source changes (s)')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    print('{} viewers, interval {}s, new data every {}s, {}s per run'.format(
+        args.viewers, args.interval, args.change_period, args.duration))
+    print('{:<6}{:>10}{:>14}{:>14}{:>10}'.format(
+        'mode', 'requests', 'requests/s', 'server cpu s', 'messages'))
+    for i, mode in enumerate(['poll', 'push']):
+        r = run(mode, args.viewers, args.interval, args.change_period,
+                args.duration, args.port + i)
+        print('{:<6}{:>10}{:>14.1f}{:>14.3f}{:>10}'.format(
+            r['mode'], r['requests'], r['requests/s'], r['server cpu s'],
+            '-' if r['messages'] is None else r['messages']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Time the JSON encoding of real callback responses and layouts.
+
+Each app below is imported from its own folder, its callback is called with
+the inputs a first page load would send, and the returned figure (wrapped
+the way Dash wraps a response) is encoded with
+
+  json:    the stdlib json module with PlotlyJSONEncoder (Dash 0.x/1.x)
+  plotly:  plotly.io.json.to_json_plotly with its default engine (Dash 2)
+  orjson:  shared/serializer.py's OrjsonSerializer
+
+and so is the app's layout, as /_dash-layout serves it. The table shows the
+median time per encode and the size of the result. Run from the repo root:
+
+    python benchmarks/serializers.py
+    python benchmarks/serializers.py --repeat 200
+"""
+import argparse
+import os
+import runpy
+import statistics
+import sys
+import time
+import warnings
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from shared.serializer import JSONSerializer, OrjsonSerializer  # noqa: E402
+
+# app script -> (callback, output, arguments)
+CALLBACKS = {
+    '2-07-DashCallbacks/callback2.py':
+        ('update_figure', 'graph.figure', [2007]),
+    '2-08-MultipleInputs/callback3.py':
+        ('update_graph', 'feature-graphic.figure',
+         ['displacement', 'acceleration']),
+    '2-16-UpdatingGraphsInteractively/updating2.py':
+        ('callback_graph', 'mpg_line.figure',
+         [{'points': [{'pointIndex': 0}]}]),
+    'dbc_examples/gallery/iris-kmeans/app.py':
+        ('make_graph', 'cluster-graph.figure',
+         ['sepal length (cm)', 'sepal width (cm)', 3]),
+}
+
+
+def load_app(path):
+    """Run an app script from its own directory, without serving it."""
+    directory, script = os.path.split(os.path.join(ROOT_DIR, path))
+    cwd, sys_path = os.getcwd(), list(sys.path)
+    os.chdir(directory)
+    sys.path.insert(0, directory)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            return runpy.run_path(script, run_name='benchmark')
+    finally:
+        os.chdir(cwd)
+        sys.path[:] = sys_path
+
+
+def encoders():
+    from plotly.io.json import to_json_plotly
+
+    return {
+        'json': JSONSerializer().dumps,
+        'plotly': to_json_plotly,
+        'orjson': OrjsonSerializer().dumps,
+    }
+
+
+def median_ms(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    print('{:<48}{:<10}{:>10}{:>10}'.format('payload', 'encoder', 'ms',
+                                            'bytes'))
+    for path, (name, output, arguments) in CALLBACKS.items():
+        namespace = load_app(path)
+        script = path.split('/')[-1]
+        if script == 'app.py':
+            script = path.split('/')[-2]
+        component, prop = output.rsplit('.', 1)
+        figure = namespace[name](*arguments)
+        payloads = {
+            name: {'response': {component: {prop: figure}}, 'multi': True},
+            'layout': namespace['app']._layout_value(),
+        }
+        for label, payload in payloads.items():
+            for encoder, dumps in encoders().items():
+                ms = median_ms(lambda: dumps(payload), args.repeat)
+                print('{:<48}{:<10}{:>10.3f}{:>10,}'.format(
+                    '{} {}'.format(script, label), encoder, ms,
+                    len(dumps(payload))))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Compare plain JSON figures with shared/typedarrays.py's binary blocks.
+
+For each size, a scatter of ``n`` points like 1-02E's Sol1-Scatterplot
+(x from randn, y from rand) is serialized two ways:
+
+  text:   json.dumps with PlotlyJSONEncoder, every float as decimal text
+          (what plotly.py before v6 and the repo's figures.to_json did)
+  typed:  typedarrays.to_json, both arrays as base64 float64 blocks
+
+and the table shows the encode time, the payload size, and with --gzip
+its gzipped size (what a compressing server would send). The figure is
+built as plain dicts so that plotly.py's own array handling, which differs
+between versions, does not get in the way. Run from the repo root:
+
+    python benchmarks/typed_arrays.py
+    python benchmarks/typed_arrays.py --sizes 1000 100000 --gzip
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+import numpy as np
+from plotly.utils import PlotlyJSONEncoder
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared import typedarrays  # noqa: E402
+
+
+def scatter(n, seed=0):
+    rng = np.random.RandomState(seed)
+    return {
+        'data': [{'type': 'scatter', 'mode': 'markers',
+                  'x': rng.randn(n), 'y': rng.rand(n)}],
+        'layout': {'title': 'Random Data Scatterplot', 'hovermode': 'closest'},
+    }
+
+
+def encoders():
+    return {
+        'text': lambda figure: json.dumps(figure, cls=PlotlyJSONEncoder),
+        'typed': typedarrays.to_json,
+    }
+
+
+def best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[10 ** k for k in range(3, 8)])
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='runs per size below 1e6 points, best one shown')
+    parser.add_argument('--gzip', action='store_true',
+                        help='also show the gzipped payload size')
+    args = parser.parse_args()
+
+    header = '{:>10}  {:<6}{:>12}{:>14}'.format('points', 'format',
+                                                'encode ms', 'bytes')
+    print(header + ('{:>14}'.format('gzip bytes') if args.gzip else ''))
+    for n in args.sizes:
+        figure = scatter(n)
+        repeat = args.repeat if n < 10 ** 6 else 1
+        for name, encode in encoders().items():
+            seconds, text = best_of(lambda: encode(figure), repeat)
+            payload = text.encode()
+            row = '{:>10}  {:<6}{:>12.1f}{:>14,}'.format(
+                n, name, seconds * 1000, len(payload))
+            if args.gzip:
+                row += '{:>14,}'.format(len(gzip.compress(payload, 6)))
+            print(row)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,16 @@
 """
 A simple app demonstrating how to dynamically render tab content containing
 dcc.Graph components to ensure graphs get sized correctly. We also show how
-dcc.Store can be used to cache the results of an expensive graph generation
-process so that switching tabs is fast.
+the results of an expensive graph generation process can be cached so that
+switching tabs is fast: the figures are kept in a server-side FigureStore
+and the dcc.Store only holds their key, so a tab switch sends the browser
+just the figures on that tab. The generation itself runs as a background
+job: the button callback returns straight away and a dbc.Progress bar
+follows the job until its graphs are ready.
 """
+import sys
 import time
+import uuid
 
 import dash
 import dash_bootstrap_components as dbc
@@ -12,68 +18,105 @@ import dash_core_components as dcc
 import dash_html_components as html
 import numpy as np
 import plotly.graph_objs as go
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, State
+from dash.exceptions import PreventUpdate
+
+sys.path.append("../..")  # makes the shared/ helpers importable
+from shared.figures import FigureStore  # noqa: E402
+from shared.jobs import JobRunner  # noqa: E402
+
+figures = FigureStore(spill_dir=".figure_cache")
+jobs = JobRunner()
 
 app = dash.Dash(external_stylesheets=[dbc.themes.BOOTSTRAP])
 
-app.layout = dbc.Container(
-    [
-        dcc.Store(id="store"),
-        html.H1("Dynamically rendered tab content"),
-        html.Hr(),
-        dbc.Button(
-            "Regenerate graphs",
-            color="primary",
-            block=True,
-            id="button",
-            className="mb-3",
-        ),
-        dbc.Tabs(
-            [
-                dbc.Tab(label="Scatter", tab_id="scatter"),
-                dbc.Tab(label="Histograms", tab_id="histogram"),
-            ],
-            id="tabs",
-        ),
-        html.Div(id="tab-content", className="p-4"),
-    ]
-)
+
+def serve_layout():
+    # a fresh id per page load, so a new click supersedes this page's
+    # previous job without touching anybody else's
+    return dbc.Container(
+        [
+            dcc.Store(id="client-id", data=uuid.uuid4().hex),
+            dcc.Store(id="job"),
+            dcc.Store(id="store"),
+            dcc.Interval(id="poll", interval=250, disabled=True),
+            html.H1("Dynamically rendered tab content"),
+            html.Hr(),
+            dbc.Button(
+                "Regenerate graphs",
+                color="primary",
+                block=True,
+                id="button",
+                className="mb-3",
+            ),
+            dbc.Progress(
+                id="progress", value=0, striped=True, animated=True,
+                className="mb-3",
+            ),
+            dbc.Tabs(
+                [
+                    dbc.Tab(label="Scatter", tab_id="scatter"),
+                    dbc.Tab(label="Histograms", tab_id="histogram"),
+                ],
+                id="tabs",
+            ),
+            html.Div(id="tab-content", className="p-4"),
+        ]
+    )
+
+
+app.layout = serve_layout
+
+
+def get_figure(key, name):
+    # no key yet: the app has just loaded, show empty graphs
+    if key is None:
+        return go.Figure(data=[])
+    return figures.get(key, name)
 
 
 @app.callback(
     Output("tab-content", "children"),
     [Input("tabs", "active_tab"), Input("store", "data")],
 )
-def render_tab_content(active_tab, data):
+def render_tab_content(active_tab, key):
     """
     This callback takes the 'active_tab' property as input, as well as the
-    stored graphs, and renders the tab content depending on what the value of
-    'active_tab' is.
+    key of the stored graphs, and renders the tab content depending on what
+    the value of 'active_tab' is.
     """
-    if active_tab and data is not None:
-        if active_tab == "scatter":
-            return dcc.Graph(figure=data["scatter"])
-        elif active_tab == "histogram":
-            return dbc.Row(
-                [
-                    dbc.Col(dcc.Graph(figure=data["hist_1"]), width=6),
-                    dbc.Col(dcc.Graph(figure=data["hist_2"]), width=6),
-                ]
-            )
-    return data
+    if active_tab:
+        try:
+            if active_tab == "scatter":
+                return dcc.Graph(figure=get_figure(key, "scatter"))
+            elif active_tab == "histogram":
+                return dbc.Row(
+                    [
+                        dbc.Col(
+                            dcc.Graph(figure=get_figure(key, "hist_1")),
+                            width=6,
+                        ),
+                        dbc.Col(
+                            dcc.Graph(figure=get_figure(key, "hist_2")),
+                            width=6,
+                        ),
+                    ]
+                )
+        except KeyError:
+            # the server no longer has these graphs (e.g. it was restarted)
+            return "These graphs have expired, please regenerate them."
+    return "No tab selected"
 
 
-@app.callback(Output("store", "data"), [Input("button", "n_clicks")])
-def generate_graphs(n):
+def generate_graphs(job):
     """
-    This callback generates three simple graphs from random data.
+    This job generates three simple graphs from random data, reporting its
+    progress as it goes.
     """
-    if not n:
-        # generate empty graphs when app loads
-        return {k: go.Figure(data=[]) for k in ["scatter", "hist_1", "hist_2"]}
-
     # simulate expensive graph generation process
-    time.sleep(2)
+    for step in range(20):
+        job.report(step / 20)
+        time.sleep(0.1)
 
     # generate 100 multivariate normal samples
     data = np.random.multivariate_normal([0, 0], [[1, 0.5], [0.5, 1]], 100)
@@ -84,8 +127,66 @@ def generate_graphs(n):
     hist_1 = go.Figure(data=[go.Histogram(x=data[:, 0])])
     hist_2 = go.Figure(data=[go.Histogram(x=data[:, 1])])
 
-    # save figures in a dictionary for sending to the dcc.Store
-    return {"scatter": scatter, "hist_1": hist_1, "hist_2": hist_2}
+    # keep the figures on the server and send only their key to the dcc.Store
+    return figures.put(
+        {"scatter": scatter, "hist_1": hist_1, "hist_2": hist_2}
+    )
+
+
+@app.callback(
+    Output("job", "data"),
+    [Input("button", "n_clicks")],
+    [State("client-id", "data")],
+)
+def start_job(n, client_id):
+    """
+    This callback starts a graph generation job. Clicks from this page
+    that arrive while its job is running share it instead of starting
+    another; other pages get graphs of their own.
+    """
+    if not n:
+        raise PreventUpdate
+    return jobs.submit(
+        generate_graphs, key=("generate_graphs", client_id), owner=client_id
+    )
+
+
+@app.callback(
+    [
+        Output("progress", "value"),
+        Output("progress", "children"),
+        Output("poll", "disabled"),
+    ],
+    [Input("poll", "n_intervals"), Input("job", "data")],
+)
+def poll_job(n, job_id):
+    """
+    This callback follows the job's progress: a new job turns polling on,
+    and it stops once the job has finished one way or another.
+    """
+    if job_id is None:
+        raise PreventUpdate
+    status = jobs.status(job_id)
+    progress = status["progress"]
+    finished = status["state"] not in ("pending", "running")
+    label = "{}%".format(progress) if progress >= 5 else ""
+    if status["state"] in ("failed", "cancelled", "unknown"):
+        label = "Job {}".format(status["state"])
+    return progress, label, finished
+
+
+@app.callback(
+    Output("store", "data"),
+    [Input("progress", "value")],
+    [State("job", "data")],
+)
+def collect_result(progress, job_id):
+    """
+    This callback swaps in the new graphs once the job is done.
+    """
+    if job_id is None or jobs.status(job_id)["state"] != "done":
+        raise PreventUpdate
+    return jobs.result(job_id)
 
 
 if __name__ == "__main__":
@@ -660,10 +660,18 @@ def toggle_popover(n, is_open):
     return is_open
 
 
-@app.callback(Output("progress", "value"), [Input("interval", "n_intervals")])
-def advance_progress(n):
-    # advance to 100 then pause for a bit
-    return min(n % 111, 100)
+# runs in the browser: the value only depends on the tick count, so there
+# is no need for a request to the server every 500ms
+app.clientside_callback(
+    """
+    function(n) {
+        // advance to 100 then pause for a bit
+        return Math.min(n % 111, 100);
+    }
+    """,
+    Output("progress", "value"),
+    [Input("interval", "n_intervals")],
+)
 
 
 if __name__ == "__main__":
@@ -3,21 +3,29 @@ Dash port of Shiny faithful example:
 
 https://shiny.rstudio.com/gallery/faithful.html
 
-Note: the shiny version includes a slider for adjusting the bandwidth of the
-density approximation curve, which is not easily adjusted when using
-plotly.figure_factory.create_distplot, so it doesn't feature in this example.
+The histogram and density curve come from shared/density.py rather than
+plotly.figure_factory.create_distplot: they are computed once per bin count
+and bandwidth and reused, and that also makes the shiny version's bandwidth
+adjustment slider possible.
 """
+import sys
+
 import dash
 import dash_bootstrap_components as dbc
 import dash_core_components as dcc
 import dash_html_components as html
 import pandas as pd
-import plotly.figure_factory as ff
 from dash.dependencies import Input, Output
 
+sys.path.append("../../..")  # makes the shared/ helpers importable
+from shared import serializer, typedarrays  # noqa: E402
+from shared.density import Density, create_distplot  # noqa: E402
+
 DATA = pd.read_csv("https://cdn.opensource.faculty.ai/old-faithful/data.csv")
+ERUPTIONS = Density(DATA.eruptions)
 
 app = dash.Dash(external_stylesheets=[dbc.themes.BOOTSTRAP])
+serializer.install()
 
 dropdown = dbc.FormGroup(
     [
@@ -30,6 +38,20 @@ dropdown = dbc.FormGroup(
     ]
 )
 
+bandwidth_slider = dbc.FormGroup(
+    [
+        dbc.Label("Bandwidth adjustment:"),
+        dcc.Slider(
+            id="bandwidth",
+            min=0.2,
+            max=2,
+            step=0.2,
+            value=1,
+            marks={i: str(i) for i in [0.2, 1, 2]},
+        ),
+    ]
+)
+
 checklist = dbc.FormGroup(
     [
         dbc.Label("Extras:"),
@@ -56,6 +78,7 @@ app.layout = dbc.Container(
                 dbc.Col(checklist, width="auto", align="center"),
             ]
         ),
+        dbc.Row(dbc.Col(bandwidth_slider, md=6)),
         html.Br(),
         dcc.Graph(id="graph"),
     ]
@@ -64,16 +87,21 @@ app.layout = dbc.Container(
 
 @app.callback(
     Output("graph", "figure"),
-    [Input("dropdown", "value"), Input("checklist", "value")],
+    [
+        Input("dropdown", "value"),
+        Input("checklist", "value"),
+        Input("bandwidth", "value"),
+    ],
 )
-def make_graph(dropdown_value, checklist_value):
-    bin_size = (DATA.eruptions.max() - DATA.eruptions.min()) / dropdown_value
-    fig = ff.create_distplot(
-        [DATA.eruptions],
+def make_graph(dropdown_value, checklist_value, bandwidth):
+    bin_size = (ERUPTIONS.end - ERUPTIONS.start) / dropdown_value
+    fig = create_distplot(
+        [ERUPTIONS],
         ["Eruption duration"],
         bin_size=bin_size,
         show_curve="show_dens" in checklist_value,
         show_rug="show_ind" in checklist_value,
+        bw_adjust=bandwidth,
     )
     fig["layout"].update(
         {
@@ -83,7 +111,7 @@ def make_graph(dropdown_value, checklist_value):
             "yaxis": {"title": "Density"},
         }
     )
-    return fig
+    return typedarrays.encode(fig)
 
 
 if __name__ == "__main__":
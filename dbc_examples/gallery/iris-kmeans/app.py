@@ -3,6 +3,8 @@ Dash port of Shiny iris k-means example:
 
 https://shiny.rstudio.com/gallery/kmeans-example.html
 """
+import sys
+
 import dash
 import dash_bootstrap_components as dbc
 import dash_core_components as dcc
@@ -11,12 +13,20 @@ import pandas as pd
 import plotly.graph_objs as go
 from dash.dependencies import Input, Output
 from sklearn import datasets
-from sklearn.cluster import KMeans
+
+from clustering import ClusteringService
+
+sys.path.append("../../..")  # makes the shared/ helpers importable
+from shared import serializer, typedarrays  # noqa: E402
 
 iris_raw = datasets.load_iris()
 iris = pd.DataFrame(iris_raw["data"], columns=iris_raw["feature_names"])
 
+# fits are cached per (x, y, cluster count)
+clusters = ClusteringService(iris)
+
 app = dash.Dash(external_stylesheets=[dbc.themes.BOOTSTRAP])
+serializer.install()
 
 controls = dbc.Card(
     [
@@ -80,17 +90,16 @@ app.layout = dbc.Container(
 )
 def make_graph(x, y, n_clusters):
     # minimal input validation, make sure there's at least one cluster
-    km = KMeans(n_clusters=max(n_clusters, 1))
-    df = iris.loc[:, [x, y]]
-    km.fit(df.values)
-    df["cluster"] = km.labels_
+    n_clusters = max(n_clusters, 1)
+    result = clusters.fit(x, y, n_clusters)
+    labels = result.labels
 
-    centers = km.cluster_centers_
+    centers = result.centers
 
     data = [
         go.Scatter(
-            x=df.loc[df.cluster == c, x],
-            y=df.loc[df.cluster == c, y],
+            x=iris[x].values[labels == c],
+            y=iris[y].values[labels == c],
             mode="markers",
             marker={"size": 8},
             name="Cluster {}".format(c),
@@ -110,7 +119,8 @@ def make_graph(x, y, n_clusters):
 
     layout = {"xaxis": {"title": x}, "yaxis": {"title": y}}
 
-    return go.Figure(data=data, layout=layout)
+    # the scatters' coordinates go out as binary blocks, not decimal text
+    return typedarrays.encode(go.Figure(data=data, layout=layout))
 
 
 # make sure that x and y values can't be the same variable
@@ -0,0 +1,81 @@
+"""
+Benchmark ClusteringService against refitting KMeans on every callback.
+
+The iris data is enlarged by repeating it with a little Gaussian jitter.
+For each size we time the sequence of fits a user produces by changing the
+cluster count and going back: k = 3, 4, 5, 4, 3.
+
+    python benchmark.py --rows 150 15000 150000 1500000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn import datasets
+from sklearn.cluster import KMeans
+
+from clustering import ClusteringService
+
+X, Y = "sepal length (cm)", "sepal width (cm)"
+SEQUENCE = [3, 4, 5, 4, 3]
+
+
+def enlarged_iris(rows, seed=0):
+    iris_raw = datasets.load_iris()
+    values = iris_raw["data"]
+    rng = np.random.RandomState(seed)
+    values = values[rng.randint(0, len(values), rows)]
+    values = values + rng.normal(0, 0.1, values.shape)
+    return pd.DataFrame(values, columns=iris_raw["feature_names"])
+
+
+def time_baseline(df):
+    """What make_graph did: a fresh KMeans with default settings each time."""
+    times = []
+    for k in SEQUENCE:
+        start = time.perf_counter()
+        KMeans(n_clusters=k).fit(df.loc[:, [X, Y]].values)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def time_service(df):
+    service = ClusteringService(df)
+    times = []
+    for k in SEQUENCE:
+        start = time.perf_counter()
+        service.fit(X, Y, k)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[150, 15000, 150000]
+    )
+    args = parser.parse_args()
+
+    print("k sequence: {}".format(SEQUENCE))
+    print(
+        "{:>9}  {:<9}{}".format(
+            "rows", "", "  ".join("{:>8}".format("k=%d" % k) for k in SEQUENCE)
+        )
+    )
+    for rows in args.rows:
+        df = enlarged_iris(rows)
+        for name, timer in [("refit", time_baseline), ("service", time_service)]:
+            times = timer(df)
+            print(
+                "{:>9}  {:<9}{}  total {:.3f}s".format(
+                    rows,
+                    name,
+                    "  ".join("{:>7.1f}ms".format(t * 1000) for t in times),
+                    sum(times),
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
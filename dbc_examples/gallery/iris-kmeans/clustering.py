@@ -0,0 +1,81 @@
+"""
+Memoized k-means fits for the iris k-means app.
+
+The app refits KMeans from scratch (with several random initialisations)
+every time a dropdown or the cluster count changes. ClusteringService:
+
+- remembers every fit by (x column, y column, k, seed), so going back to a
+  previous combination costs nothing;
+- lets identical fits requested at the same time share one run;
+- switches to MiniBatchKMeans once the data has more than
+  ``minibatch_rows`` rows.
+
+Fits run in the callback's own thread: for data the size of iris a fit
+takes milliseconds, far less than handing it to another process would.
+"""
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future
+
+from sklearn.cluster import KMeans, MiniBatchKMeans
+
+Clustering = namedtuple("Clustering", ["labels", "centers"])
+
+
+def _fit(points, k, seed, minibatch_rows):
+    if len(points) > minibatch_rows:
+        # stop on small centre moves too; the default (inertia-only)
+        # stopping rule runs many times longer on large data
+        km = MiniBatchKMeans(
+            n_clusters=k, random_state=seed, batch_size=4096, tol=1e-4
+        )
+    else:
+        km = KMeans(n_clusters=k, random_state=seed)
+    km.fit(points)
+    return Clustering(km.labels_, km.cluster_centers_)
+
+
+class ClusteringService:
+    """k-means fits over the columns of one DataFrame, cached by input."""
+
+    def __init__(self, df, minibatch_rows=50000, cache_size=64, seed=0):
+        self.columns = list(df.columns)
+        self.values = df.values.astype(float)
+        self.minibatch_rows = minibatch_rows
+        self.cache_size = cache_size
+        self.seed = seed
+        self._cache = OrderedDict()
+        self._running = {}
+        self._lock = threading.Lock()
+
+    def fit(self, x, y, k):
+        """Fit (or fetch) the clustering of columns x and y into k clusters."""
+        key = (x, y, k, self.seed)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            running = self._running.get(key)
+            if running is None:
+                future = self._running[key] = Future()
+        if running is not None:
+            # the same fit is already being computed for another request
+            return running.result()
+
+        try:
+            points = self.values[
+                :, [self.columns.index(x), self.columns.index(y)]
+            ]
+            result = _fit(points, k, self.seed, self.minibatch_rows)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._running.pop(key, None)
+        with self._lock:
+            self._cache[key] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        future.set_result(result)
+        return result
@@ -3,8 +3,8 @@ Dash port of Shiny wordcloud example:
 
 https://shiny.rstudio.com/gallery/word-cloud.html
 """
-import base64
-import io
+import uuid
+from concurrent.futures import CancelledError
 from functools import lru_cache
 from urllib.request import urlopen
 
@@ -12,9 +12,12 @@ import dash
 import dash_bootstrap_components as dbc
 import dash_core_components as dcc
 import dash_html_components as html
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, State
+from dash.exceptions import PreventUpdate
 from wordcloud import WordCloud
 
+from rendering import SortedFrequencies, WordCloudRenderer
+
 BASE_URL = "https://cdn.opensource.faculty.ai/wordcloud"
 
 DOCUMENT_URLS = {
@@ -34,6 +37,14 @@ def load_word_frequencies(book):
     return WC.process_text(text)
 
 
+# words sorted by frequency once per book, so filtering is a bisect
+@lru_cache(maxsize=3)
+def sorted_frequencies(book):
+    return SortedFrequencies(load_word_frequencies(book))
+
+
+renderer = WordCloudRenderer()
+
 app = dash.Dash(external_stylesheets=[dbc.themes.BOOTSTRAP])
 
 dropdown = dcc.Dropdown(
@@ -82,20 +93,27 @@ controls = dbc.Card(
     body=True,
 )
 
-app.layout = dbc.Container(
-    [
-        html.H1("Word Cloud"),
-        html.Hr(),
-        dbc.Row(
-            [
-                dbc.Col(controls, md=4),
-                dbc.Col(dbc.Card(dbc.CardImg(id="wordcloud")), md=8),
-            ],
-            align="center",
-        ),
-    ],
-    fluid=True,
-)
+
+def serve_layout():
+    # a fresh id per page load identifies the client to the renderer
+    return dbc.Container(
+        [
+            dcc.Store(id="client-id", data=uuid.uuid4().hex),
+            html.H1("Word Cloud"),
+            html.Hr(),
+            dbc.Row(
+                [
+                    dbc.Col(controls, md=4),
+                    dbc.Col(dbc.Card(dbc.CardImg(id="wordcloud")), md=8),
+                ],
+                align="center",
+            ),
+        ],
+        fluid=True,
+    )
+
+
+app.layout = serve_layout
 
 
 @app.callback(
@@ -105,33 +123,18 @@ app.layout = dbc.Container(
         Input("min-freq-slider", "value"),
         Input("max-vocab-slider", "value"),
     ],
+    [State("client-id", "data")],
 )
-def make_wordcloud(book, min_freq, max_vocab):
+def make_wordcloud(book, min_freq, max_vocab, client_id):
     # filter frequencies based on min_freq and max_vocab
-    sorted_frequencies = sorted(
-        load_word_frequencies(book).items(), key=lambda x: x[1], reverse=True
-    )
-    frequencies = {
-        k: v for k, v in sorted_frequencies[:max_vocab] if v >= min_freq
-    }
-
-    wc = WordCloud(
-        width=1000,
-        height=500,
-        max_words=max_vocab,
-        background_color="white",
-        colormap="plasma",
-    )
-
-    buffer = io.BytesIO()
-    wc.generate_from_frequencies(frequencies).to_image().save(
-        buffer, format="png"
-    )
-    buffer.seek(0)
-
-    return "data:image/png;base64,{}".format(
-        base64.b64encode(buffer.read()).decode()
-    )
+    frequencies = sorted_frequencies(book)
+    n_words = frequencies.top(min_freq, max_vocab)
+
+    try:
+        return renderer.render(book, frequencies, n_words, client_id)
+    except CancelledError:
+        # superseded by a newer request from the same client
+        raise PreventUpdate
 
 
 if __name__ == "__main__":
@@ -0,0 +1,144 @@
+"""
+Cached, off-thread word cloud rendering for the wordcloud app.
+
+Rendering a 1000x500 word cloud takes far longer than anything else the app
+does, and the callback used to do it on every slider change. WordCloudRenderer:
+
+- filters frequencies with a bisect over counts sorted once per book;
+- caches finished images, bounded by their total size; the cache key is the
+  set of words actually drawn, so slider positions that select the same
+  words share one image;
+- renders in a process pool, with identical renders requested at the same
+  time sharing one job;
+- keeps at most one queued render per client, so a render a client has
+  already moved past is cancelled instead of delaying the one it now wants.
+"""
+import base64
+import io
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from wordcloud import WordCloud
+
+
+def render_png(frequencies, width=1000, height=500):
+    """A word cloud of the frequencies as a base64 PNG data URI."""
+    wc = WordCloud(
+        width=width,
+        height=height,
+        max_words=max(len(frequencies), 1),
+        background_color="white",
+        colormap="plasma",
+    )
+
+    buffer = io.BytesIO()
+    wc.generate_from_frequencies(frequencies).to_image().save(
+        buffer, format="png"
+    )
+    return "data:image/png;base64,{}".format(
+        base64.b64encode(buffer.getvalue()).decode()
+    )
+
+
+class SortedFrequencies:
+    """Word frequencies sorted by descending count, filtered by bisection."""
+
+    def __init__(self, frequencies):
+        ranked = sorted(frequencies.items(), key=lambda x: x[1], reverse=True)
+        self.words = [word for word, _ in ranked]
+        self.counts = [count for _, count in ranked]
+        # ascending copy of -count for bisect
+        self._negated = [-count for count in self.counts]
+
+    def top(self, min_freq, max_vocab):
+        """Number of words kept: at most max_vocab, each seen min_freq times."""
+        return min(bisect_right(self._negated, -min_freq), max(max_vocab, 0))
+
+    def select(self, n):
+        """The n most frequent words and their counts."""
+        return dict(zip(self.words[:n], self.counts[:n]))
+
+
+class WordCloudRenderer:
+    """Renders word clouds in worker processes and caches the results."""
+
+    def __init__(self, max_workers=2, max_bytes=64 * 2 ** 20):
+        self.max_workers = max_workers
+        self.max_bytes = max_bytes
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+        self._running = {}
+        self._waiters = {}
+        self._queued = {}
+        # re-entrant: cancelling a future runs _store on the same thread
+        self._lock = threading.RLock()
+        self._executor = None
+
+    def _pool(self):
+        # created on first use so importing the app doesn't fork workers
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def submit(self, book, frequencies, n, client=None):
+        """
+        A Future for the image of the top n words of ``book``.
+
+        ``frequencies`` is the book's SortedFrequencies. A new request from
+        ``client`` cancels that client's previous render if it hasn't
+        started yet; its Future then raises CancelledError.
+        """
+        key = (book, n)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                done = Future()
+                done.set_result(self._cache[key])
+                return done
+
+            if client is not None:
+                self._cancel_queued(client, key)
+
+            future = self._running.get(key)
+            if future is None:
+                future = self._pool().submit(render_png, frequencies.select(n))
+                self._running[key] = future
+                self._waiters[key] = set()
+                future.add_done_callback(lambda f: self._store(key, f))
+            if client is not None:
+                self._waiters[key].add(client)
+                self._queued[client] = key
+            return future
+
+    def _cancel_queued(self, client, key):
+        previous = self._queued.pop(client, None)
+        if previous is None or previous == key:
+            return
+        waiters = self._waiters.get(previous)
+        if waiters is None:
+            return
+        waiters.discard(client)
+        # only drop the render if nobody else is waiting for it
+        if not waiters:
+            self._running[previous].cancel()
+
+    def _store(self, key, future):
+        with self._lock:
+            self._running.pop(key, None)
+            for client in self._waiters.pop(key, ()):
+                if self._queued.get(client) == key:
+                    del self._queued[client]
+            if future.cancelled() or future.exception() is not None:
+                return
+            image = future.result()
+            self._cache[key] = image
+            self._cache_bytes += len(image)
+            while self._cache_bytes > self.max_bytes and len(self._cache) > 1:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_bytes -= len(evicted)
+
+    def render(self, book, frequencies, n, client=None):
+        """The image of the top n words of ``book``, as a data URI."""
+        return self.submit(book, frequencies, n, client).result()
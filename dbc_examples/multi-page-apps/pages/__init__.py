@@ -0,0 +1,4 @@
+"""
+Page modules for the multi-page apps. Each defines ``layout``; the apps
+import them lazily through shared.pages.PageRegistry.
+"""
@@ -0,0 +1,13 @@
+"""The 404 page, shown for any pathname that isn't registered."""
+import dash_bootstrap_components as dbc
+import dash_html_components as html
+
+
+def layout(pathname):
+    return dbc.Jumbotron(
+        [
+            html.H1("404: Not found", className="text-danger"),
+            html.Hr(),
+            html.P(f"The pathname {pathname} was not recognised..."),
+        ]
+    )
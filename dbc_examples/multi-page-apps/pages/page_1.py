@@ -0,0 +1,4 @@
+"""Page 1."""
+import dash_html_components as html
+
+layout = html.P("This is the content of page 1!")
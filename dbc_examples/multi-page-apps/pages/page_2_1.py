@@ -0,0 +1,4 @@
+"""Page 2.1."""
+import dash_html_components as html
+
+layout = html.P("Oh cool, this is page 2.1!")
@@ -0,0 +1,4 @@
+"""Page 2.2."""
+import dash_html_components as html
+
+layout = html.P("No way! This is page 2.2!")
@@ -0,0 +1,4 @@
+"""Page 3."""
+import dash_html_components as html
+
+layout = html.P("Oh cool, this is page 3!")
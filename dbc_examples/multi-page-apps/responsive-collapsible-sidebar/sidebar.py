@@ -7,20 +7,27 @@ links get hidden in a collapse element. We use a callback to toggle the
 collapse when on a small screen, and the custom CSS to hide the toggle, and
 force the collapse to stay open when the screen is large.
 
-dcc.Location is used to track the current location. There are two callbacks,
-one uses the current location to render the appropriate page content, the other
-uses the current location to toggle the "active" properties of the navigation
-links.
+dcc.Location is used to track the current location. A single callback, set up
+by shared.router.Router, uses the current location both to render the
+appropriate page content and to toggle the "active" properties of the
+navigation links.
 
 For more details on building multi-page Dash applications, check out the Dash
 documentation: https://dash.plot.ly/urls
 """
+import sys
+
 import dash
 import dash_bootstrap_components as dbc
 import dash_core_components as dcc
 import dash_html_components as html
 from dash.dependencies import Input, Output, State
 
+sys.path.append("..")  # the pages/ package shared by these apps
+sys.path.append("../../..")  # makes the shared/ helpers importable
+from shared.pages import PageRegistry  # noqa: E402
+from shared.router import Router  # noqa: E402
+
 app = dash.Dash(
     external_stylesheets=[dbc.themes.BOOTSTRAP],
     # these meta_tags ensure content is scaled correctly on different devices
@@ -106,36 +113,27 @@ content = html.Div(id="page-content")
 
 app.layout = html.Div([dcc.Location(id="url"), sidebar, content])
 
+pages = PageRegistry(
+    {
+        "/page-1": "pages.page_1",
+        "/page-2": "pages.page_2",
+        "/page-3": "pages.page_3",
+    },
+    # Treat page 1 as the homepage / index
+    aliases={"/": "/page-1"},
+    not_found="pages.not_found",
+)
+# page modules are imported on first visit; only the landing page is
+# loaded at startup
+pages.preload("/")
 
-# this callback uses the current pathname to set the active state of the
-# corresponding nav link to true, allowing users to tell see page they are on
-@app.callback(
-    [Output(f"page-{i}-link", "active") for i in range(1, 4)],
-    [Input("url", "pathname")],
+
+# a single callback resolves the page content and the "active" state of each
+# nav link from the current pathname, so a navigation is one request
+router = Router(
+    pages, links={f"page-{i}-link": f"/page-{i}" for i in range(1, 4)}
 )
-def toggle_active_links(pathname):
-    if pathname == "/":
-        # Treat page 1 as the homepage / index
-        return True, False, False
-    return [pathname == f"/page-{i}" for i in range(1, 4)]
-
-
-@app.callback(Output("page-content", "children"), [Input("url", "pathname")])
-def render_page_content(pathname):
-    if pathname in ["/", "/page-1"]:
-        return html.P("This is the content of page 1!")
-    elif pathname == "/page-2":
-        return html.P("This is the content of page 2. Yay!")
-    elif pathname == "/page-3":
-        return html.P("Oh cool, this is page 3!")
-    # If the user tries to reach a different page, return a 404 message
-    return dbc.Jumbotron(
-        [
-            html.H1("404: Not found", className="text-danger"),
-            html.Hr(),
-            html.P(f"The pathname {pathname} was not recognised..."),
-        ]
-    )
+router.register(app)
 
 
 @app.callback(
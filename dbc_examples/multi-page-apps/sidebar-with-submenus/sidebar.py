@@ -2,19 +2,24 @@
 This app creates a simple sidebar layout using inline style arguments and the
 dbc.Nav component.
 
-dcc.Location is used to track the current location. There are two callbacks,
-one uses the current location to render the appropriate page content, the other
-uses the current location to toggle the "active" properties of the navigation
-links.
+dcc.Location is used to track the current location. A single callback, set up
+by shared.router.Router, uses it to render the appropriate page content and
+also handles the clicks that open and close the submenus.
 
 For more details on building multi-page Dash applications, check out the Dash
 documentation: https://dash.plot.ly/urls
 """
+import sys
+
 import dash
 import dash_bootstrap_components as dbc
 import dash_core_components as dcc
 import dash_html_components as html
-from dash.dependencies import Input, Output, State
+
+sys.path.append("..")  # the pages/ package shared by these apps
+sys.path.append("../../..")  # makes the shared/ helpers importable
+from shared.pages import PageRegistry  # noqa: E402
+from shared.router import Router  # noqa: E402
 
 # link fontawesome to get the chevron icons
 FA = "https://use.fontawesome.com/releases/v5.8.1/css/all.css"
@@ -104,52 +109,32 @@ content = html.Div(id="page-content", style=CONTENT_STYLE)
 
 app.layout = html.Div([dcc.Location(id="url"), sidebar, content])
 
-
-# this function is used to toggle the is_open property of each Collapse
-def toggle_collapse(n, is_open):
-    if n:
-        return not is_open
-    return is_open
-
-
-# this function applies the "open" class to rotate the chevron
-def set_navitem_class(is_open):
-    if is_open:
-        return "open"
-    return ""
-
-
-for i in [1, 2]:
-    app.callback(
-        Output(f"submenu-{i}-collapse", "is_open"),
-        [Input(f"submenu-{i}", "n_clicks")],
-        [State(f"submenu-{i}-collapse", "is_open")],
-    )(toggle_collapse)
-
-    app.callback(
-        Output(f"submenu-{i}", "className"),
-        [Input(f"submenu-{i}-collapse", "is_open")],
-    )(set_navitem_class)
-
-
-@app.callback(Output("page-content", "children"), [Input("url", "pathname")])
-def render_page_content(pathname):
-    if pathname in ["/", "/page-1/1"]:
-        return html.P("This is the content of page 1.1!")
-    elif pathname == "/page-1/2":
-        return html.P("This is the content of page 1.2. Yay!")
-    elif pathname == "/page-2/1":
-        return html.P("Oh cool, this is page 2.1!")
-    elif pathname == "/page-2/2":
-        return html.P("No way! This is page 2.2!")
-    # If the user tries to reach a different page, return a 404 message
-    return dbc.Jumbotron(
-        [
-            html.H1("404: Not found", className="text-danger"),
-            html.Hr(),
-            html.P(f"The pathname {pathname} was not recognised..."),
-        ]
-    )
+pages = PageRegistry(
+    {
+        "/page-1/1": "pages.page_1_1",
+        "/page-1/2": "pages.page_1_2",
+        "/page-2/1": "pages.page_2_1",
+        "/page-2/2": "pages.page_2_2",
+    },
+    aliases={"/": "/page-1/1"},
+    not_found="pages.not_found",
+)
+# page modules are imported on first visit; only the landing page is
+# loaded at startup
+pages.preload("/")
+
+
+# a single callback renders the page content, toggles a submenu when its
+# header is clicked (and restyles the header to rotate its chevron), and opens
+# the submenu holding the current page, so each interaction is one request
+router = Router(
+    pages,
+    submenus={
+        "submenu-1": ["/page-1/1", "/page-1/2"],
+        "submenu-2": ["/page-2/1", "/page-2/2"],
+    },
+)
+router.register(app)
 
 
 if __name__ == "__main__":
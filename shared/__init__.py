@@ -0,0 +1,7 @@
+"""
+Helpers shared by the course scripts and dashboards.
+
+The section folders are plain scripts that are run from their own directory,
+so they make this package importable with ``sys.path.append('..')`` in the
+same way they already reach the data files with ``'../data/...'``.
+"""
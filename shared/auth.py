@@ -0,0 +1,234 @@
+"""
+Password login with signed session cookies, in place of dash_auth.BasicAuth.
+
+BasicAuth compares the browser's username and password against a plaintext
+list on every request the page makes (layout, assets, each callback).
+SessionAuth keeps the same browser login prompt, but:
+
+- passwords are stored only as salted PBKDF2 hashes (CredentialStore),
+  which can be loaded from a file of ``username:hash`` lines;
+- the slow hash check runs once per login, after which the response sets
+  a cookie holding the username and an expiry, signed with HMAC-SHA256;
+- later requests only need that signature checked, and the result of the
+  check is cached, so each request costs a dictionary lookup.
+
+    store = CredentialStore.from_file('users.txt')
+    auth = SessionAuth(app, store)
+
+Hashes for the file are made with ``python -m shared.auth users.txt NAME``,
+which asks for the password and appends the line.
+
+Cookies are signed with DASH_AUTH_SECRET (or the ``secret`` argument).
+Every server process has to use the same one: without it each process makes
+up its own, so a cookie issued by one gunicorn or uWSGI worker is refused by
+the next, and the slow password check runs again. SessionAuth therefore
+refuses to start under those servers, or with WEB_CONCURRENCY above 1,
+unless a secret is set, and warns that sessions end with the process
+otherwise:
+
+    DASH_AUTH_SECRET=$(python -c "import secrets; print(secrets.token_hex())") \
+        gunicorn -w 4 "auth1:app.server"
+"""
+import base64
+import binascii
+import hashlib
+import hmac
+import os
+import sys
+import time
+import warnings
+from functools import lru_cache
+
+ALGORITHM = 'pbkdf2_sha256'
+ITERATIONS = 200000
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+def hash_password(password, salt=None, iterations=ITERATIONS):
+    """``pbkdf2_sha256$iterations$salt$hash`` for a password."""
+    salt = salt or os.urandom(16)
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, iterations)
+    return '{}${}${}${}'.format(
+        ALGORITHM, iterations, _b64encode(salt), _b64encode(digest))
+
+
+def verify_password(password, encoded):
+    """Whether ``password`` matches a hash from hash_password."""
+    try:
+        algorithm, iterations, salt, digest = encoded.split('$')
+    except ValueError:
+        return False
+    if algorithm != ALGORITHM:
+        return False
+    try:
+        salt, digest = _b64decode(salt), _b64decode(digest)
+        iterations = int(iterations)
+    except (ValueError, binascii.Error):
+        return False  # a damaged line in the credentials file
+    candidate = hashlib.pbkdf2_hmac(
+        'sha256', password.encode(), salt, iterations)
+    return hmac.compare_digest(candidate, digest)
+
+
+class CredentialStore:
+    """Username -> password hash."""
+
+    def __init__(self, hashes=None):
+        self.hashes = dict(hashes or {})
+        # checked for unknown users, so they take as long as known ones
+        self._dummy = hash_password('')
+
+    @classmethod
+    def from_pairs(cls, pairs):
+        """Hash ``[username, password]`` pairs, e.g. a BasicAuth list."""
+        return cls({name: hash_password(password) for name, password in pairs})
+
+    @classmethod
+    def from_file(cls, path):
+        """Read ``username:hash`` lines; blank lines and # comments skipped."""
+        hashes = {}
+        with open(path) as f:
+            for number, line in enumerate(f, 1):
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    name, sep, encoded = line.partition(':')
+                    if not sep:
+                        raise ValueError('{}, line {}: expected username:hash'
+                                         .format(path, number))
+                    hashes[name] = encoded
+        return cls(hashes)
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def verify(self, username, password):
+        encoded = self.hashes.get(username)
+        if encoded is None:
+            verify_password(password, self._dummy)
+            return False
+        return verify_password(password, encoded)
+
+
+class SessionSigner:
+    """Issues and checks ``payload.signature`` session tokens."""
+
+    def __init__(self, secret, max_age=8 * 3600, cache_size=4096):
+        self.secret = secret
+        self.max_age = max_age
+        self.check = lru_cache(maxsize=cache_size)(self._check)
+
+    def _sign(self, payload):
+        mac = hmac.new(self.secret, payload.encode(), hashlib.sha256)
+        return _b64encode(mac.digest())
+
+    def issue(self, username, now=None):
+        expires = int((now or time.time()) + self.max_age)
+        payload = _b64encode('{}|{}'.format(username, expires).encode())
+        return '{}.{}'.format(payload, self._sign(payload))
+
+    def _check(self, token):
+        """``(username, expires)`` if the signature is valid, else None."""
+        payload, _, signature = token.partition('.')
+        # as bytes: compare_digest refuses str with non-ASCII characters
+        if not hmac.compare_digest(self._sign(payload).encode(),
+                                   signature.encode('utf-8', 'replace')):
+            return None
+        try:
+            username, expires = _b64decode(payload).decode().rsplit('|', 1)
+            return username, int(expires)
+        except (ValueError, binascii.Error, UnicodeDecodeError):
+            return None
+
+    def username(self, token, now=None):
+        """The user a token was issued to, or None if invalid or expired."""
+        checked = self.check(token) if token else None
+        if checked is None or checked[1] < (now or time.time()):
+            return None
+        return checked[0]
+
+
+def _several_processes():
+    """Whether this app may be served by more than one worker process."""
+    try:
+        if int(os.environ.get('WEB_CONCURRENCY', 1)) > 1:
+            return True
+    except ValueError:
+        pass
+    return 'gunicorn' in sys.modules or 'uwsgi' in sys.modules
+
+
+class SessionAuth:
+    """
+    Protects every route of a Dash app. A request with a valid session
+    cookie passes; otherwise the browser's Basic credentials are checked
+    against ``store`` and, if they match, a session cookie is set.
+    """
+
+    def __init__(self, app, store, secret=None, max_age=8 * 3600,
+                 cookie_name='dash_session', secure=False, realm='Dash'):
+        from flask import g, request
+
+        self.store = store
+        secret = secret or os.environ.get('DASH_AUTH_SECRET')
+        if not secret:
+            if _several_processes():
+                raise RuntimeError(
+                    'Set DASH_AUTH_SECRET: each worker process would sign '
+                    'sessions with its own random secret and refuse the '
+                    'cookies of the others')
+            warnings.warn('DASH_AUTH_SECRET is not set; sessions are signed '
+                          'with a random secret and end with this process')
+        self.signer = SessionSigner(
+            secret.encode() if secret else os.urandom(32), max_age)
+        self.cookie_name = cookie_name
+        self.secure = secure
+        self.realm = realm
+        self._request, self._g = request, g
+
+        app.server.before_request(self._authenticate)
+        app.server.after_request(self._set_cookie)
+
+    def _authenticate(self):
+        from flask import Response
+
+        token = self._request.cookies.get(self.cookie_name)
+        if self.signer.username(token) is not None:
+            return None
+        credentials = self._request.authorization
+        if credentials and self.store.verify(credentials.username,
+                                             credentials.password or ''):
+            self._g.session_token = self.signer.issue(credentials.username)
+            return None
+        return Response(
+            'Login required', 401,
+            {'WWW-Authenticate': 'Basic realm="{}"'.format(self.realm)})
+
+    def _set_cookie(self, response):
+        token = self._g.pop('session_token', None)
+        if token is not None:
+            response.set_cookie(
+                self.cookie_name, token, max_age=self.signer.max_age,
+                httponly=True, samesite='Lax', secure=self.secure)
+        return response
+
+
+def add_user(path, username, password):
+    """Append a ``username:hash`` line to a credentials file."""
+    with open(path, 'a') as f:
+        f.write('{}:{}\n'.format(username, hash_password(password)))
+
+
+if __name__ == '__main__':
+    import getpass
+    import sys
+
+    if len(sys.argv) != 3:
+        sys.exit('usage: python -m shared.auth CREDENTIALS_FILE USERNAME')
+    add_user(sys.argv[1], sys.argv[2], getpass.getpass())
@@ -0,0 +1,257 @@
+"""
+Build every chart script in the 1-0* sections in one go.
+
+Running the scripts one by one starts a fresh interpreter per chart, which
+imports plotly and pandas and parses its CSV every time. This runs them in
+a pool of worker processes that import those once, and memoize each data
+file per worker. The charts are written in report.py's publishing mode,
+all sharing a single plotly.js asset:
+
+    python -m shared.build                # -> reports/
+    python -m shared.build --out site -j 8 1-04 1-09
+    python -m shared.build --force        # rebuild even unchanged charts
+
+A script is rebuilt only when something it depends on changed since the
+last build: its own source, the data files it read, any module in shared/
+or the plotly version. The fingerprints are kept in a manifest in
+the output directory, next to an index.html linking every chart.
+"""
+import argparse
+import glob
+import hashlib
+import html
+import json
+import os
+import runpy
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from shared import datasets
+
+ROOT_DIR = datasets.ROOT_DIR
+SECTIONS = '1-0*'
+MANIFEST = '.build-manifest.json'
+# chart scripts that cannot be built from this repo alone
+EXCLUDE = {
+    # reads Data/thebutton_presses.csv, which is not in the repo
+    os.path.join('1-07-Histograms', 'hist5.py'),
+}
+
+# set in each worker by _init_worker
+_reads = None
+
+
+def discover(patterns=()):
+    """The chart scripts (those calling report.plot) under the sections."""
+    scripts = []
+    for path in sorted(glob.glob(os.path.join(ROOT_DIR, SECTIONS, '*.py'))):
+        section = os.path.basename(os.path.dirname(path))
+        if patterns and not any(section.startswith(p) for p in patterns):
+            continue
+        if os.path.relpath(path, ROOT_DIR) in EXCLUDE:
+            continue
+        with open(path, encoding='utf-8') as f:
+            if 'report.plot(' in f.read():
+                scripts.append(path)
+    return scripts
+
+
+def _digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def shared_sources():
+    """Paths of every module in shared/, imported directly or not."""
+    return sorted(glob.glob(os.path.join(ROOT_DIR, 'shared', '*.py')))
+
+
+def fingerprint(script, data_files):
+    """Everything a chart depends on, as a dict of name -> content hash."""
+    import plotly
+
+    inputs = {'plotly': plotly.__version__}
+    for path in [script] + shared_sources() + sorted(data_files):
+        if os.path.exists(path):
+            inputs[os.path.relpath(path, ROOT_DIR)] = _digest(path)
+        else:
+            inputs[os.path.relpath(path, ROOT_DIR)] = None
+    return inputs
+
+
+def _init_worker(out_dir):
+    """Import the heavy modules once and share data files across scripts."""
+    global _reads
+    import pandas as pd
+    import plotly.graph_objs  # noqa: F401
+
+    from shared import report
+
+    report.REPORT_DIR = out_dir
+    _reads = set()
+    frames = {}
+    loading = []
+    pandas_read_csv = pd.read_csv
+
+    def read_csv(name, *args, **kwargs):
+        try:
+            path = datasets.find_file(name)
+        except (TypeError, FileNotFoundError):
+            path = None
+        if path is None or args or loading:
+            # not one of the course data files (a URL, a buffer, ...), or
+            # datasets.read_csv itself parsing one on a cache miss
+            return pandas_read_csv(name, *args, **kwargs)
+        _reads.add(path)
+        key = path, repr(sorted(kwargs.items()))
+        if key not in frames:
+            loading.append(path)
+            try:
+                frames[key] = datasets_read_csv(path, **kwargs)
+            finally:
+                loading.pop()
+        return frames[key].copy()
+
+    datasets_read_csv = datasets.read_csv
+    datasets.read_csv = read_csv
+    pd.read_csv = read_csv
+
+
+def _build(script):
+    """Run one chart script in its own folder; report what it read and wrote."""
+    from shared import report
+
+    _reads.clear()
+    outputs = []
+    write_chart = report.write_chart
+
+    def record(*args, **kwargs):
+        path = write_chart(*args, **kwargs)
+        outputs.append(path)
+        return path
+
+    report.write_chart = record
+    cwd, path = os.getcwd(), list(sys.path)
+    start = time.perf_counter()
+    try:
+        os.chdir(os.path.dirname(script))
+        sys.path.insert(0, os.path.dirname(script))
+        runpy.run_path(script, run_name='__main__')
+        error = None
+    except BaseException:
+        error = traceback.format_exc(limit=3)
+    finally:
+        os.chdir(cwd)
+        sys.path[:] = path
+        report.write_chart = write_chart
+    return {
+        'script': script,
+        'outputs': outputs,
+        'data': sorted(_reads),
+        'seconds': time.perf_counter() - start,
+        'error': error,
+    }
+
+
+def _load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _is_current(entry, script):
+    if entry is None:
+        return False
+    outputs = [os.path.join(ROOT_DIR, p) for p in entry['outputs']]
+    if not outputs or not all(os.path.exists(p) for p in outputs):
+        return False
+    data = [os.path.join(ROOT_DIR, p) for p in entry['data']]
+    return entry['inputs'] == fingerprint(script, data)
+
+
+def write_index(out_dir, manifest):
+    """index.html linking every chart, grouped by section."""
+    sections = {}
+    for entry in manifest.values():
+        for output in entry['outputs']:
+            path = os.path.join(ROOT_DIR, output)
+            rel = os.path.relpath(path, out_dir).replace(os.sep, '/')
+            sections.setdefault(rel.split('/')[0], []).append(rel)
+    lines = ['<!DOCTYPE html>', '<html>', '<head><meta charset="utf-8">',
+             '<title>Charts</title></head>', '<body>', '<h1>Charts</h1>']
+    for section in sorted(sections):
+        lines.append('<h2>{}</h2>'.format(html.escape(section)))
+        lines.append('<ul>')
+        for rel in sorted(sections[section]):
+            lines.append('<li><a href="{0}">{1}</a></li>'.format(
+                html.escape(rel), html.escape(rel.split('/', 1)[-1])))
+        lines.append('</ul>')
+    lines += ['</body>', '</html>', '']
+    with open(os.path.join(out_dir, 'index.html'), 'w') as f:
+        f.write('\n'.join(lines))
+
+
+def build(out_dir, patterns=(), jobs=None, force=False):
+    """Build the charts that need it; returns (built, skipped, failed)."""
+    out_dir = os.path.abspath(out_dir)
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = _load_manifest(out_dir)
+
+    scripts = discover(patterns)
+    todo = [s for s in scripts if force or not _is_current(
+        manifest.get(os.path.relpath(s, ROOT_DIR)), s)]
+    built, failed = [], []
+    if todo:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(out_dir,)) as pool:
+            futures = [pool.submit(_build, script) for script in todo]
+            for future in as_completed(futures):
+                result = future.result()
+                name = os.path.relpath(result['script'], ROOT_DIR)
+                if result['error']:
+                    failed.append((name, result['error']))
+                    manifest.pop(name, None)
+                    continue
+                built.append((name, result['seconds']))
+                manifest[name] = {
+                    'inputs': fingerprint(result['script'], result['data']),
+                    'data': [os.path.relpath(p, ROOT_DIR)
+                             for p in result['data']],
+                    'outputs': [os.path.relpath(p, ROOT_DIR)
+                                for p in result['outputs']],
+                }
+
+    with open(os.path.join(out_dir, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    write_index(out_dir, manifest)
+    return built, len(scripts) - len(todo), failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('sections', nargs='*',
+                        help='only sections whose folder starts with these')
+    parser.add_argument('--out', default=os.path.join(ROOT_DIR, 'reports'))
+    parser.add_argument('-j', '--jobs', type=int, default=None)
+    parser.add_argument('--force', action='store_true')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    built, skipped, failed = build(args.out, args.sections, args.jobs,
+                                   args.force)
+    for name, seconds in sorted(built):
+        print('built   {:<50}{:6.2f}s'.format(name, seconds))
+    for name, error in failed:
+        print('FAILED  {}\n{}'.format(name, error))
+    print('{} built, {} unchanged, {} failed in {:.1f}s -> {}'.format(
+        len(built), skipped, len(failed), time.perf_counter() - start,
+        args.out))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
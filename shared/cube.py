@@ -0,0 +1,61 @@
+"""
+A year x indicator x country cube of a long-format indicators table.
+
+Tables like Chris Parmer's indicators.csv have one row per (country,
+indicator, year). Plotting indicator X against indicator Y for one year
+means three boolean filters over the whole frame per callback. IndicatorCube
+pivots the table into a dense NumPy array once, so the same question is two
+array slices joined on the country axis, and the answers for recently used
+(year, x, y) triples are memoized:
+
+    cube = IndicatorCube(df)
+    x, y, countries = cube.pair(2007, 'Fertility rate, ...', 'Life expectancy ...')
+"""
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+
+class IndicatorCube:
+    """Dense ``values[year, indicator, country]`` array, NaN where missing."""
+
+    def __init__(self, df, year='Year', indicator='Indicator Name',
+                 country='Country Name', value='Value', cache_size=128):
+        self.years = pd.Index(np.sort(df[year].unique()))
+        self.indicators = pd.Index(df[indicator].unique())
+        self.countries = pd.Index(df[country].unique())
+
+        self.values = np.full(
+            (len(self.years), len(self.indicators), len(self.countries)),
+            np.nan,
+        )
+        self.values[
+            self.years.get_indexer(df[year]),
+            self.indicators.get_indexer(df[indicator]),
+            self.countries.get_indexer(df[country]),
+        ] = df[value].values
+        self._country_names = np.asarray(self.countries, dtype=object)
+        self.pair = lru_cache(maxsize=cache_size)(self._pair)
+
+    def series(self, year, indicator):
+        """
+        One indicator for one year, as an array over all countries; all NaN
+        if either is not in the cube (e.g. a cleared dropdown's None).
+        """
+        i = self.years.get_indexer([year])[0]
+        j = self.indicators.get_indexer([indicator])[0]
+        if i < 0 or j < 0:
+            return np.full(len(self.countries), np.nan)
+        return self.values[i, j]
+
+    def _pair(self, year, x_indicator, y_indicator):
+        """
+        ``(x, y, countries)`` lists for the countries that have both
+        indicators in ``year``; empty lists for keys not in the cube.
+        """
+        x = self.series(year, x_indicator)
+        y = self.series(year, y_indicator)
+        both = ~(np.isnan(x) | np.isnan(y))
+        return (x[both].tolist(), y[both].tolist(),
+                self._country_names[both].tolist())
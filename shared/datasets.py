@@ -0,0 +1,279 @@
+"""
+Cached loading of the CSV files in Data/ and SourceData/.
+
+The first time a file is read it is parsed with pandas as usual, and every
+column is written to its own ``.npy`` file under the cache directory. Later
+reads memory-map those arrays back instead of parsing the text again, which
+keeps start-up (and gunicorn worker fork) time flat no matter how large the
+CSV is. Each cache entry records the source file's mtime, size and SHA-1, so
+editing a CSV rebuilds its cache on the next read. A file with an object
+column that is not plain text (e.g. booleans with gaps, or mixed types) is
+not cached at all and is parsed by pandas on every read.
+
+Usage from a section folder:
+
+    import sys
+    sys.path.append('..')
+    from shared import datasets
+
+    df = datasets.read_csv('FremontBridgeBicycles.csv')
+
+Run ``python -m shared.datasets`` from the repo root to build every cache
+ahead of time (e.g. before starting gunicorn with --preload).
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIRS = [
+    os.path.join(ROOT_DIR, 'Data'),
+    os.path.join(ROOT_DIR, 'SourceData'),
+]
+CACHE_DIR = os.environ.get(
+    'DATASET_CACHE_DIR', os.path.join(ROOT_DIR, '.dataset_cache')
+)
+
+# bump this whenever the on-disk layout below changes
+FORMAT_VERSION = 2
+
+# numpy kinds that np.save/np.load(mmap_mode='r') handle natively:
+# bool, signed/unsigned int, float, complex, timedelta and datetime
+_NATIVE_KINDS = 'biufcmM'
+
+
+def find_file(name):
+    """
+    Return the absolute path of a data file.
+
+    ``name`` may be a real path, or just a file name (or one of the scripts'
+    '../data/...' style paths) that is looked up in Data/ and SourceData/.
+    The lookup ignores case because the scripts were written on a
+    case-insensitive file system ('../data' vs 'Data').
+    """
+    if os.path.isfile(name):
+        return os.path.abspath(name)
+    wanted = os.path.basename(name).lower()
+    for directory in DATA_DIRS:
+        if not os.path.isdir(directory):
+            continue
+        for candidate in os.listdir(directory):
+            if candidate.lower() == wanted:
+                return os.path.join(directory, candidate)
+    raise FileNotFoundError('No data file named {!r}'.format(name))
+
+
+def file_signature(path):
+    """Return the (mtime_ns, size, sha1) triple the cache is keyed on."""
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size, _sha1(path)
+
+
+def _sha1(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_path(path, read_kwargs):
+    # different read_csv options give different frames, so they get
+    # their own cache entry
+    options = repr(sorted(read_kwargs.items())).encode()
+    tag = hashlib.sha1(path.encode() + b'\0' + options).hexdigest()[:10]
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(CACHE_DIR, '{}-{}'.format(stem, tag))
+
+
+def _read_meta(entry):
+    try:
+        with open(os.path.join(entry, 'meta.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _is_fresh(meta, entry, path):
+    """
+    Check a cache entry against its source file. The cheap mtime/size check
+    is tried first; the file is only hashed when the mtime moved (a checkout
+    or a copy touches mtime without changing the content).
+    """
+    if meta is None or meta.get('version') != FORMAT_VERSION:
+        return False
+    st = os.stat(path)
+    if meta['size'] != st.st_size:
+        return False
+    if meta['mtime'] == st.st_mtime_ns:
+        return True
+    if meta['sha1'] != _sha1(path):
+        return False
+    # same content, new mtime: remember it so the next check is cheap again
+    meta['mtime'] = st.st_mtime_ns
+    try:
+        _write_json(os.path.join(entry, 'meta.json'), meta)
+    except OSError:
+        pass
+    return True
+
+
+def _write_json(path, obj):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(obj, f)
+    os.replace(tmp, path)
+
+
+def _save_frame(df, path, entry):
+    """Write ``df`` column by column into a fresh cache entry."""
+    mtime, size, sha1 = file_signature(path)
+    index_names = []
+    if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 \
+            or df.index.step != 1:
+        index_names = list(df.index.names)
+        df = df.reset_index()
+
+    for i in range(df.shape[1]):
+        values = df.iloc[:, i].values
+        if not (isinstance(values, np.ndarray) and
+                values.dtype.kind in _NATIVE_KINDS) and \
+                pd.api.types.infer_dtype(values, skipna=True) not in \
+                ('string', 'empty'):
+            # only text survives the unicode round trip below; a column of
+            # e.g. booleans with gaps would come back as 'True'/'False'
+            return
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix='.tmp-', dir=CACHE_DIR)
+    try:
+        columns = []
+        # native columns of one dtype share a 2-D block file (one row per
+        # column), so a wide CSV costs one mmap per dtype, not per column
+        blocks = {}
+        for i, name in enumerate(df.columns):
+            series = df.iloc[:, i]
+            values = series.values
+            column = {'name': name}
+            if isinstance(values, np.ndarray) and \
+                    values.dtype.kind in _NATIVE_KINDS:
+                block = blocks.setdefault(values.dtype.str, [])
+                column['block'] = 'b{}.npy'.format(
+                    list(blocks).index(values.dtype.str))
+                column['row'] = len(block)
+                block.append(values)
+            else:
+                # text is stored as fixed-width unicode, which can still
+                # be memory-mapped, plus a null mask
+                nulls = series.isnull().values
+                column['file'] = 'c{}.npy'.format(i)
+                np.save(os.path.join(tmp, column['file']), np.array(
+                    series.where(~nulls, '').astype(str).tolist(),
+                    dtype=np.str_,
+                ))
+                if nulls.any():
+                    column['nulls'] = 'n{}.npy'.format(i)
+                    np.save(os.path.join(tmp, column['nulls']), nulls)
+            columns.append(column)
+        for b, arrays in enumerate(blocks.values()):
+            np.save(os.path.join(tmp, 'b{}.npy'.format(b)), np.vstack(arrays))
+
+        _write_json(os.path.join(tmp, 'meta.json'), {
+            'version': FORMAT_VERSION,
+            'source': path,
+            'mtime': mtime,
+            'size': size,
+            'sha1': sha1,
+            'rows': len(df),
+            'columns': columns,
+            'index': index_names,
+        })
+        if os.path.isdir(entry):
+            shutil.rmtree(entry, ignore_errors=True)
+        os.rename(tmp, entry)
+    except OSError:
+        # another worker may have won the race to publish this entry,
+        # or the cache directory is read-only; either way the parsed
+        # frame is still good
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _load_frame(meta, entry):
+    data = {}
+    blocks = {}
+    for column in meta['columns']:
+        if 'block' in column:
+            if column['block'] not in blocks:
+                blocks[column['block']] = np.load(
+                    os.path.join(entry, column['block']), mmap_mode='r'
+                )
+            values = blocks[column['block']][column['row']]
+        else:
+            values = np.load(os.path.join(entry, column['file']), mmap_mode='r')
+            values = values.astype(object)
+            if 'nulls' in column:
+                nulls = np.load(os.path.join(entry, column['nulls']))
+                values[nulls] = np.nan
+        data[column['name']] = values
+    names = [column['name'] for column in meta['columns']]
+    df = pd.DataFrame(data, columns=names)
+
+    index_names = meta['index']
+    if index_names:
+        df = df.set_index(names[:len(index_names)])
+        df.index.names = index_names
+    return df
+
+
+def read_csv(name, **kwargs):
+    """
+    Drop-in replacement for ``pd.read_csv`` on the course data files.
+
+    Keyword arguments are passed on to ``pd.read_csv`` on a cache miss and
+    are part of the cache key, so ``read_csv('mocksurvey.csv', index_col=0)``
+    and ``read_csv('mocksurvey.csv')`` are cached separately.
+    """
+    path = find_file(name)
+    entry = _cache_path(path, kwargs)
+    meta = _read_meta(entry)
+    if _is_fresh(meta, entry, path):
+        try:
+            return _load_frame(meta, entry)
+        except (OSError, ValueError, KeyError):
+            pass  # damaged entry, rebuild it below
+
+    df = pd.read_csv(path, **kwargs)
+    _save_frame(df, path, entry)
+    return df
+
+
+def warm(directories=None):
+    """
+    Build the cache for every CSV file in ``directories`` (default: Data/
+    and SourceData/). Returns the list of files that could not be parsed.
+    """
+    failed = []
+    for directory in directories or DATA_DIRS:
+        for filename in sorted(os.listdir(directory)):
+            if not filename.lower().endswith('.csv'):
+                continue
+            try:
+                read_csv(os.path.join(directory, filename))
+            except (ValueError, UnicodeDecodeError, pd.errors.ParserError):
+                failed.append(filename)
+    return failed
+
+
+def clear():
+    """Delete every cache entry."""
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    for filename in warm():
+        print('could not cache {}'.format(filename))
@@ -0,0 +1,172 @@
+"""
+Line series thinned to a point budget, at full resolution once zoomed in.
+
+A trace with tens of thousands of points (the Fremont Bridge hourly counts,
+a day of live samples) costs a large payload and a slow first draw, yet a
+1200px wide graph cannot show more than a couple of thousand of them apart.
+Downsampler keeps the full series on the server and hands out at most
+``budget`` points for whatever x range is on screen:
+
+    series = Downsampler(df.index.values, df['East'].values, budget=2000)
+    x, y = series.window()                  # whole series, <= 2000 points
+    x, y = series.window(start, end)        # the zoomed-in range
+
+so a callback listening to the graph's relayoutData (see relayout_range)
+can send the visible window again, at full resolution as soon as it holds
+fewer points than the budget. Two ways of picking the points:
+
+  lttb    Largest-Triangle-Three-Buckets (Steinarsson, 2013). Keeps the
+          points that shape the line; the default for line charts.
+  minmax  the lowest and highest point of each bucket. Keeps every peak
+          and dip, e.g. for spiky counts drawn as bars or markers.
+
+For long inputs lttb first reduces the series with minmax to a few points
+per bucket (MinMaxLTTB, Van Der Donckt et al., 2023), so everything but the
+last, budget-sized step runs in NumPy.
+"""
+import numpy as np
+import pandas as pd
+
+# minmax points kept per output point before LTTB picks its points
+MINMAX_RATIO = 4
+
+
+def _as_float(x):
+    """x as float64 for the arithmetic; datetimes as their integer ticks."""
+    x = np.asarray(x)
+    if x.dtype.kind == 'M':
+        x = x.view('i8')
+    return x.astype(float)
+
+
+def minmax(x, y, n):
+    """
+    Indices of about ``n`` points: the first and last point, and the
+    minimum and maximum of ``y`` in each of ``(n - 2) // 2`` equal-count
+    buckets in between, in order.
+    """
+    size = len(y)
+    if n >= size:
+        return np.arange(size)
+    buckets = max((n - 2) // 2, 1)
+    inner = np.asarray(y, dtype=float)[1:-1]
+    width = len(inner) // buckets
+    # equal-width buckets as rows of a 2-D view; the few points past the
+    # last full row join it as their own bucket
+    missing = np.isnan(inner)
+    low = np.where(missing, np.inf, inner)
+    high = np.where(missing, -np.inf, inner)
+    full = width * buckets
+    offsets = np.arange(buckets) * width
+    picks = [offsets + low[:full].reshape(buckets, width).argmin(axis=1),
+             offsets + high[:full].reshape(buckets, width).argmax(axis=1)]
+    if full < len(inner):
+        picks.append([full + low[full:].argmin(), full + high[full:].argmax()])
+    picks = np.unique(np.concatenate(picks)) + 1
+    return np.concatenate([[0], picks, [size - 1]])
+
+
+def lttb(x, y, n):
+    """Indices of the ``n`` points Largest-Triangle-Three-Buckets keeps."""
+    size = len(y)
+    if n >= size or n < 3:
+        return np.arange(size) if n >= size else np.array([0, size - 1])
+    x, y = _as_float(x), np.asarray(y, dtype=float)
+    if size > MINMAX_RATIO * n:
+        keep = minmax(x, y, MINMAX_RATIO * n)
+        return keep[_lttb(x[keep], y[keep], n)]
+    return _lttb(x, y, n)
+
+
+def _lttb(x, y, n):
+    size = len(y)
+    # n - 2 buckets of (nearly) equal count between the fixed end points
+    edges = np.linspace(1, size - 1, n - 1).astype(int)
+    # each bucket's mean point, the "third point" for the bucket before it
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[:-1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(np.nan_to_num(y[:-1]), edges[:-1]) / counts
+    next_x = np.append(mean_x[1:], x[-1]).tolist()
+    next_y = np.append(mean_y[1:], y[-1]).tolist()
+
+    # the buckets hold a handful of points each (see MINMAX_RATIO), few
+    # enough that plain floats beat a NumPy call per bucket
+    xs, ys = x.tolist(), y.tolist()
+    picks = [0]
+    ax, ay = xs[0], ys[0]
+    for start, end, cx, cy in zip(edges[:-1].tolist(), edges[1:].tolist(),
+                                  next_x, next_y):
+        # twice the triangle area between a, each candidate and the mean
+        # of the next bucket; NaN areas never win
+        dx, dy = ax - cx, cy - ay
+        best, j = -1.0, start
+        for k in range(start, end):
+            area = abs(dx * (ys[k] - ay) - (ax - xs[k]) * dy)
+            if area > best:
+                best, j = area, k
+        picks.append(j)
+        ax, ay = xs[j], ys[j]
+    picks.append(size - 1)
+    return np.array(picks)
+
+
+METHODS = {
+    'lttb': lttb,
+    'minmax': minmax,
+}
+
+
+class Downsampler:
+    """A full-resolution series handed out ``budget`` points at a time."""
+
+    def __init__(self, x, y, budget=2000, method='lttb'):
+        x, y = np.asarray(x), np.asarray(y)
+        order = np.argsort(x, kind='stable')
+        self.x, self.y = x[order], y[order]
+        self.budget = budget
+        self.method = METHODS[method]
+
+    def __len__(self):
+        return len(self.x)
+
+    def _bound(self, value):
+        if value is None or self.x.dtype.kind != 'M':
+            return value
+        # plotly sends dates as e.g. '2013-05-01 12:30:15.1234'
+        return pd.Timestamp(value).to_datetime64().astype(self.x.dtype)
+
+    def window(self, start=None, end=None):
+        """
+        ``(x, y)`` for ``start <= x <= end`` (either may be None for an
+        open end) and one point either side, so the line runs on past the
+        edges of the graph. Thinned to ``budget`` points if longer.
+        """
+        first = 0 if start is None else max(
+            np.searchsorted(self.x, self._bound(start), 'left') - 1, 0)
+        last = len(self.x) if end is None else min(
+            np.searchsorted(self.x, self._bound(end), 'right') + 1,
+            len(self.x))
+        x, y = self.x[first:last], self.y[first:last]
+        if len(x) > self.budget:
+            keep = self.method(x, y, self.budget)
+            x, y = x[keep], y[keep]
+        return x, y
+
+
+def relayout_range(relayout_data, axis='xaxis'):
+    """
+    The x range a dcc.Graph's relayoutData asks for: ``(start, end)`` after
+    a zoom or pan, ``(None, None)`` after a reset (autorange), and None
+    when the event did not change that axis (e.g. a y-only zoom).
+    """
+    if not relayout_data:
+        return None
+    if relayout_data.get(axis + '.autorange'):
+        return None, None
+    if axis + '.range[0]' in relayout_data:
+        return (relayout_data[axis + '.range[0]'],
+                relayout_data[axis + '.range[1]'])
+    if axis + '.range' in relayout_data:
+        start, end = relayout_data[axis + '.range']
+        return start, end
+    return None
@@ -0,0 +1,215 @@
+"""
+Caches of finished figures, keyed by the callback input they depend on.
+
+When a callback's output depends only on a small set of input values (e.g.
+the 12 years of the gapminder data), every figure can be built once and
+reused. FigureCache keeps each figure as plain JSON-ready data plus its
+serialized bytes, so a cache hit does no pandas or plotly work at all. The
+cache watches the CSV the figures came from and starts over (reloading the
+data) when that file changes:
+
+    figures = FigureCache(
+        load=lambda: datasets.read_csv('gapminderDataFiveYear.csv'),
+        build=build_year_figure,           # build(df, year) -> figure
+        source=datasets.find_file('gapminderDataFiveYear.csv'),
+        keys=lambda df: df['year'].unique(),
+    )
+    figures.get(2007)
+
+Keys usually come straight from the browser, so with ``keys`` only those
+values are ever built (others raise KeyError), and at most ``max_entries``
+figures are kept, least recently used first out.
+
+FigureStore is for figures that depend on more than a few inputs (random
+data, user uploads, ...). They stay on the server and the browser only
+holds an opaque key, e.g. in a dcc.Store, so a callback fetches just the
+figure it is about to show instead of receiving every stored figure:
+
+    store = FigureStore(spill_dir='.figure_cache')
+    key = store.put({'scatter': scatter, 'hist': hist})
+    store.get(key, 'scatter')
+"""
+import hashlib
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+
+from plotly.utils import PlotlyJSONEncoder
+
+from shared import typedarrays
+
+
+def to_json(figure):
+    """
+    Serialize a figure (go.Figure or dict of graph objects) to a str, with
+    typed array blocks when dcc.Graph can read them.
+    """
+    return json.dumps(typedarrays.encode(figure), cls=PlotlyJSONEncoder)
+
+
+class FigureCache:
+    """Lazily built, per-key figure LRU invalidated by a source file."""
+
+    def __init__(self, load, build, source=None, keys=None, max_entries=64):
+        self.load = load
+        self.build = build
+        self.source = source
+        self.keys = keys
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._data = None
+        self._known = None
+        self._figures = OrderedDict()
+
+    def _signature(self):
+        if self.source is None:
+            return None
+        st = os.stat(self.source)
+        return st.st_mtime_ns, st.st_size
+
+    def _check_source(self):
+        # one stat() per request; cheap next to rebuilding a figure
+        stamp = self._signature()
+        if self._data is None or stamp != self._stamp:
+            self._data = self.load()
+            self._known = None if self.keys is None else set(
+                self.keys(self._data))
+            self._figures = OrderedDict()
+            self._stamp = stamp
+
+    def _entry(self, key):
+        with self._lock:
+            self._check_source()
+            entry = self._figures.get(key)
+            if entry is not None:
+                self._figures.move_to_end(key)
+                return entry
+            if self._known is not None and key not in self._known:
+                raise KeyError(key)
+            text = to_json(self.build(self._data, key))
+            entry = self._figures[key] = (json.loads(text), text.encode())
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+            return entry
+
+    def get(self, key):
+        """
+        The figure for ``key`` as plain dicts and lists. Raises KeyError
+        for a key that is not one of ``keys``.
+        """
+        return self._entry(key)[0]
+
+    def get_json(self, key):
+        """The figure for ``key`` as serialized JSON bytes."""
+        return self._entry(key)[1]
+
+    def warm(self, keys):
+        """Build the figures for ``keys`` now rather than on first request."""
+        for key in keys:
+            self._entry(key)
+
+    def clear(self):
+        with self._lock:
+            self._data = None
+            self._known = None
+            self._figures = OrderedDict()
+
+
+class FigureStore:
+    """
+    Serialized figures in an in-memory LRU bounded by ``max_bytes``. With a
+    ``spill_dir``, figures evicted from memory are written there (up to
+    ``max_disk_bytes``) and read back when asked for again. The memory
+    tier belongs to one process; run several server processes against a
+    shared ``spill_dir`` only if a miss in one of them is acceptable.
+    """
+
+    def __init__(self, max_bytes=64 * 2 ** 20, spill_dir=None,
+                 max_disk_bytes=2 ** 30):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._disk = OrderedDict()
+        self._disk_bytes = 0
+
+    def put(self, figures):
+        """Store a mapping of name -> figure; returns one key for them all."""
+        key = uuid.uuid4().hex
+        with self._lock:
+            for name, figure in figures.items():
+                self._remember((key, name), to_json(figure).encode())
+        return key
+
+    def get(self, key, name):
+        """
+        The figure stored as ``name`` under ``key``, as plain dicts and
+        lists. Raises KeyError once it has been evicted for good.
+        """
+        return json.loads(self.get_json(key, name))
+
+    def get_json(self, key, name):
+        """Like get, but the serialized JSON bytes."""
+        entry = (key, name)
+        with self._lock:
+            if entry in self._memory:
+                self._memory.move_to_end(entry)
+                return self._memory[entry]
+            if entry not in self._disk:
+                raise KeyError(entry)
+            path = self._path(entry)
+            self._disk_bytes -= self._disk.pop(entry)
+            try:
+                with open(path, 'rb') as f:
+                    text = f.read()
+                os.remove(path)
+            except OSError:
+                raise KeyError(entry)  # the spill file is gone
+            self._remember(entry, text)
+            return text
+
+    def _path(self, entry):
+        digest = hashlib.sha1(repr(entry).encode()).hexdigest()
+        return os.path.join(self.spill_dir, digest + '.json')
+
+    def _remember(self, entry, text):
+        self._memory[entry] = text
+        self._memory_bytes += len(text)
+        while self._memory_bytes > self.max_bytes and len(self._memory) > 1:
+            evicted, evicted_text = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted_text)
+            if self.spill_dir is not None:
+                self._spill(evicted, evicted_text)
+
+    def _spill(self, entry, text):
+        try:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            with open(self._path(entry), 'wb') as f:
+                f.write(text)
+        except OSError:
+            return  # the figure is dropped; the memory tier keeps working
+        self._disk[entry] = len(text)
+        self._disk_bytes += len(text)
+        while self._disk_bytes > self.max_disk_bytes and len(self._disk) > 1:
+            dropped, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            try:
+                os.remove(self._path(dropped))
+            except OSError:
+                pass
+
+    def clear(self):
+        with self._lock:
+            for entry in self._disk:
+                try:
+                    os.remove(self._path(entry))
+                except OSError:
+                    pass
+            self._memory.clear()
+            self._disk.clear()
+            self._memory_bytes = self._disk_bytes = 0
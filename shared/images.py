@@ -0,0 +1,79 @@
+"""
+Serving the images in Data/Images to image-swapping callbacks.
+
+The click/hover/radio examples used to open an image and base64-encode it
+into the callback response every time. ImageAssets serves the folder from a
+static Flask route instead, with ETags and a Cache-Control max-age, so a
+callback only returns a short URL and the browser fetches (or revalidates)
+each image once:
+
+    images = ImageAssets()
+    images.register(app.server)
+    ...
+    return images.url('redbicycle.jpg')
+
+When a data URI really is needed (e.g. an app exported without a server),
+data_uri() encodes each file once into a bounded LRU cache.
+"""
+import base64
+import hashlib
+import mimetypes
+import os
+from functools import lru_cache
+
+from shared import datasets
+
+IMAGES_DIR = os.path.join(datasets.ROOT_DIR, 'Data', 'Images')
+
+
+class ImageAssets:
+    """A folder of images served from ``route`` with validation headers."""
+
+    def __init__(self, directory=IMAGES_DIR, route='/images', max_age=3600):
+        self.directory = directory
+        self.route = route.rstrip('/')
+        self.max_age = max_age
+        self._versions = {}
+        self.data_uri = lru_cache(maxsize=32)(self._data_uri)
+
+    def register(self, server):
+        """Add the image route to a Flask ``server`` (``app.server`` in Dash)."""
+        from flask import send_from_directory
+
+        def image(filename):
+            # send_from_directory sets an ETag and Last-Modified and answers
+            # If-None-Match/If-Modified-Since with 304 Not Modified
+            response = send_from_directory(
+                self.directory, filename, conditional=True
+            )
+            # the URLs carry a content version, so browsers may reuse
+            # a copy for max_age without asking again
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+            response.cache_control.max_age = self.max_age
+            return response
+
+        server.add_url_rule(
+            self.route + '/<path:filename>', 'images:' + self.route, image
+        )
+
+    def version(self, filename):
+        """Short content hash, used to bust browser caches when a file changes."""
+        path = os.path.join(self.directory, filename)
+        stamp = os.stat(path).st_mtime_ns
+        cached = self._versions.get(filename)
+        if cached is None or cached[0] != stamp:
+            with open(path, 'rb') as f:
+                digest = hashlib.sha1(f.read()).hexdigest()[:12]
+            cached = self._versions[filename] = stamp, digest
+        return cached[1]
+
+    def url(self, filename):
+        """The URL a callback should return for ``filename``."""
+        return '{}/{}?v={}'.format(self.route, filename, self.version(filename))
+
+    def _data_uri(self, filename):
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        with open(os.path.join(self.directory, filename), 'rb') as f:
+            encoded = base64.b64encode(f.read()).decode()
+        return 'data:{};base64,{}'.format(mimetype, encoded)
@@ -0,0 +1,170 @@
+"""
+Run slow callback work in the background and report its progress.
+
+A callback that does seconds of work holds one of the server's request
+threads for all that time. With JobRunner the callback only submits the
+work and returns a job id; a dcc.Interval then polls ``status`` (for a
+dbc.Progress bar) until the result is ready:
+
+    jobs = JobRunner()
+
+    def generate(job, n):
+        for i in range(n):
+            job.report(i / n)   # raises JobCancelled if superseded
+            ...
+        return result
+
+    job_id = jobs.submit(generate, 10, key=('generate', 10), owner=client_id)
+    jobs.status(job_id)   # {'state': 'running', 'progress': 40}
+    jobs.result(job_id)
+
+Jobs with the same ``key`` that are still running are shared rather than
+started twice. A new job from the same ``owner`` (e.g. a per-page client
+id) supersedes that owner's previous one, which is cancelled unless other
+owners are still waiting for it. Cancellation is cooperative: a queued job
+never starts and a running one stops at its next ``report`` call.
+
+Jobs run in a thread pool, so task functions can report progress directly;
+CPU-bound work can hand its number crunching to a process pool from there.
+"""
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+
+class JobCancelled(Exception):
+    """Raised inside a task when its job has been cancelled."""
+
+
+class Job:
+    """Handle passed to a task as its first argument."""
+
+    def __init__(self, key):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.state = PENDING
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.owners = set()
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def report(self, fraction):
+        """Record progress (0 to 1); raises JobCancelled if cancelled."""
+        if self.cancelled:
+            raise JobCancelled(self.id)
+        self.progress = min(max(float(fraction), 0.0), 1.0)
+
+    def status(self):
+        status = {'state': self.state, 'progress': int(self.progress * 100)}
+        if self.error is not None:
+            status['error'] = self.error
+        return status
+
+
+class JobRunner:
+    """Thread-pool job runner with deduplication and supersession."""
+
+    def __init__(self, max_workers=4, keep=256):
+        self.keep = keep
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self._active = {}
+        self._owned = {}
+
+    def submit(self, task, *args, key=None, owner=None, **kwargs):
+        """
+        Run ``task(job, *args, **kwargs)`` in the background and return the
+        job id. ``key`` identifies identical work for deduplication.
+        """
+        with self._lock:
+            job = self._active.get(key) if key is not None else None
+            if owner is not None:
+                previous = self._owned.get(owner)
+                if previous is not None and previous is not job:
+                    self._release(previous, owner)
+            if job is None:
+                job = Job(key)
+                self._jobs[job.id] = job
+                if key is not None:
+                    self._active[key] = job
+                self._forget_finished()
+                self._executor.submit(self._run, job, task, args, kwargs)
+            if owner is not None:
+                job.owners.add(owner)
+                self._owned[owner] = job
+            return job.id
+
+    def _release(self, job, owner):
+        job.owners.discard(owner)
+        if not job.owners and job.state in (PENDING, RUNNING):
+            job._cancelled.set()
+            if self._active.get(job.key) is job:
+                del self._active[job.key]
+
+    def _run(self, job, task, args, kwargs):
+        if job.cancelled:
+            job.state = CANCELLED
+            return
+        job.state = RUNNING
+        try:
+            job.result = task(job, *args, **kwargs)
+        except JobCancelled:
+            job.state = CANCELLED
+        except Exception as e:
+            job.error = '{}: {}'.format(type(e).__name__, e)
+            job.state = FAILED
+        else:
+            job.progress = 1.0
+            job.state = DONE
+        finally:
+            with self._lock:
+                if self._active.get(job.key) is job:
+                    del self._active[job.key]
+                for owner in job.owners:
+                    if self._owned.get(owner) is job:
+                        del self._owned[owner]
+
+    def _forget_finished(self):
+        # keep at most ``keep`` jobs, dropping the oldest finished ones
+        excess = len(self._jobs) - self.keep
+        for job_id in list(self._jobs):
+            if excess <= 0:
+                break
+            if self._jobs[job_id].state in (DONE, FAILED, CANCELLED):
+                del self._jobs[job_id]
+                excess -= 1
+
+    def status(self, job_id):
+        """State and percent progress of a job ('unknown' if forgotten)."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return {'state': 'unknown', 'progress': 0}
+        return job.status()
+
+    def result(self, job_id):
+        """The return value of a finished job (KeyError if unknown)."""
+        return self._jobs[job_id].result
+
+    def cancel(self, job_id):
+        """Cancel a job outright, whoever is waiting for it."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                for owner in list(job.owners):
+                    self._release(job, owner)
+                job._cancelled.set()
+                if self._active.get(job.key) is job:
+                    del self._active[job.key]
@@ -0,0 +1,156 @@
+"""
+Background polling for the live-updating dashboards.
+
+A Poller runs one daemon thread per process that calls a ``fetch()``
+function every ``interval`` seconds and appends the result to a RingBuffer.
+Callbacks only read the buffer, so the upstream API is hit once per
+interval no matter how many browsers are watching, and memory stays bounded
+by the buffer's capacity.
+
+    flights = RingBuffer(capacity=1000)
+    Poller(fetch_flight_count, interval=6, buffer=flights).start()
+
+Every sample gets an increasing sequence number, which lets a client ask
+for just the samples it hasn't seen yet (see RingBuffer.since).
+"""
+import logging
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class RingBuffer:
+    """Fixed-capacity, thread-safe buffer of timestamped float samples."""
+
+    def __init__(self, capacity, dtype=float):
+        self.capacity = capacity
+        self._values = np.zeros(capacity, dtype=dtype)
+        self._times = np.zeros(capacity, dtype='datetime64[ms]')
+        self._lock = threading.Lock()
+        # sequence number of the most recent sample; the first one is 1
+        self.last_seq = 0
+
+    def __len__(self):
+        return min(self.last_seq, self.capacity)
+
+    def append(self, value, timestamp=None):
+        """Store a sample and return its sequence number."""
+        if timestamp is None:
+            timestamp = np.datetime64(int(time.time() * 1000), 'ms')
+        with self._lock:
+            i = self.last_seq % self.capacity
+            self._values[i] = value
+            self._times[i] = timestamp
+            self.last_seq += 1
+            return self.last_seq
+
+    def since(self, seq=0):
+        """
+        Return ``(seqs, times, values)`` for the samples newer than ``seq``,
+        oldest first. Samples that were already overwritten are skipped, so
+        at most ``capacity`` samples come back.
+        """
+        with self._lock:
+            last = self.last_seq
+            first = max(seq, last - self.capacity, 0) + 1
+            seqs = np.arange(first, last + 1)
+            slots = (seqs - 1) % self.capacity
+            return seqs, self._times[slots], self._values[slots]
+
+    def latest(self):
+        """The most recent ``(time, value)``, or None before the first sample."""
+        with self._lock:
+            if not self.last_seq:
+                return None
+            i = (self.last_seq - 1) % self.capacity
+            return self._times[i], self._values[i]
+
+
+class Poller:
+    """Calls ``fetch()`` every ``interval`` seconds on a background thread."""
+
+    def __init__(self, fetch, interval, buffer):
+        self.fetch = fetch
+        self.interval = interval
+        self.buffer = buffer
+        self._listeners = []
+        self._thread = None
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+
+    def subscribe(self, listener):
+        """Call ``listener(seq, value)`` after every new sample."""
+        self._listeners.append(listener)
+
+    def start(self):
+        """Start polling; calling it again (e.g. on a reload) is a no-op."""
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return self
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name='poller', daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def poll_once(self):
+        value = self.fetch()
+        seq = self.buffer.append(value)
+        for listener in list(self._listeners):
+            listener(seq, value)
+        return seq
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.poll_once()
+            except Exception:
+                # a failed request just means a missing sample; keep polling
+                logger.exception('poll failed')
+            elapsed = time.monotonic() - started
+            self._stop.wait(max(self.interval - elapsed, 0))
+
+
+def extend_data(buffer, last_seq, max_points):
+    """
+    Build a ``dcc.Graph.extendData`` value holding only the samples a client
+    hasn't seen, for a figure whose first trace plots ``buffer``.
+
+    ``last_seq`` is the sequence number the client saw last (keep it in a
+    dcc.Store, starting from 0). Returns ``(extend, seq)``; ``extend`` is
+    None when there is nothing new. ``max_points`` caps the trace length in
+    the browser, so both the payload and the client-side history stay
+    bounded however long the page is open.
+    """
+    seqs, times, values = buffer.since(last_seq or 0)
+    if not len(seqs):
+        return None, last_seq
+    times, values = times[-max_points:], values[-max_points:]
+    extend = [
+        {
+            'x': [np.datetime_as_string(times, unit='ms').tolist()],
+            'y': [values.tolist()],
+        },
+        [0],
+        max_points,
+    ]
+    return extend, int(seqs[-1])
+
+
+def samples_since(buffer, last_seq):
+    """
+    The samples newer than ``last_seq`` as ``(seq, {'x': ..., 'y': ...})``
+    pairs, ready to be sent as push messages (see shared.push).
+    """
+    seqs, times, values = buffer.since(last_seq or 0)
+    times = np.datetime_as_string(times, unit='ms').tolist()
+    return [(int(seq), {'x': x, 'y': y})
+            for seq, x, y in zip(seqs, times, values.tolist())]
@@ -0,0 +1,114 @@
+"""
+Dropdown option lists built from DataFrame columns.
+
+build_options() turns columns into ``[{'label': ..., 'value': ...}]`` in one
+vectorized pass instead of a ``df.loc[key]`` lookup per row. For long lists
+(e.g. every NASDAQ symbol) OptionIndex adds a server-side prefix search, so
+the initial layout only has to carry the selected options and the browser
+asks for matches as the user types:
+
+    index = OptionIndex.from_frame(nsdq, ['Symbol', 'Name'], 'Symbol')
+    index.register_callback(app, 'my_ticker_symbol')
+"""
+import bisect
+from functools import lru_cache
+
+from dash.dependencies import Input, Output, State
+
+
+def build_options(df, label_columns, value_column, sep=' '):
+    """
+    Build a Dropdown ``options`` list from DataFrame columns.
+
+    ``label_columns`` are joined with ``sep`` to make the label;
+    ``value_column`` may also name the index.
+    """
+    labels, values = _labels_and_values(df, label_columns, value_column, sep)
+    return [{'label': l, 'value': v} for l, v in zip(labels, values)]
+
+
+def _column(df, name):
+    if name in df.columns:
+        return df[name]
+    if name == df.index.name:
+        return df.index.to_series()
+    raise KeyError(name)
+
+
+def _labels_and_values(df, label_columns, value_column, sep):
+    if isinstance(label_columns, str):
+        label_columns = [label_columns]
+    labels = _column(df, label_columns[0]).astype(str)
+    for name in label_columns[1:]:
+        labels = labels.str.cat(_column(df, name).astype(str).values, sep=sep)
+    values = _column(df, value_column)
+    return labels.tolist(), values.tolist()
+
+
+class OptionIndex:
+    """Sorted prefix index over the words of a set of dropdown options."""
+
+    def __init__(self, labels, values):
+        self.options = [{'label': l, 'value': v} for l, v in zip(labels, values)]
+        self._by_value = {o['value']: o for o in self.options}
+        # every word of every label is a search key, so "tesla" and "tsla"
+        # both find 'TSLA Tesla, Inc.'
+        keys = sorted(
+            (word.lower(), i)
+            for i, label in enumerate(labels)
+            for word in str(label).split()
+        )
+        self._keys = [k for k, _ in keys]
+        self._positions = [i for _, i in keys]
+        # one cache per index, released along with it
+        self._search = lru_cache(maxsize=256)(self._search_uncached)
+
+    @classmethod
+    def from_frame(cls, df, label_columns, value_column, sep=' '):
+        labels, values = _labels_and_values(df, label_columns, value_column, sep)
+        return cls(labels, values)
+
+    def selected(self, values):
+        """The options for the given values (for the initial layout)."""
+        if values is None:
+            return []
+        if not isinstance(values, (list, tuple)):
+            values = [values]
+        return [self._by_value[v] for v in values if v in self._by_value]
+
+    def _search_uncached(self, prefix, limit):
+        lo = bisect.bisect_left(self._keys, prefix)
+        hi = bisect.bisect_left(self._keys, prefix + '\uffff')
+        seen = set()
+        found = []
+        for i in self._positions[lo:hi]:
+            if i not in seen:
+                seen.add(i)
+                found.append(i)
+        found.sort()
+        return tuple(found[:limit])
+
+    def search(self, prefix, limit=50):
+        """Options having a label word that starts with ``prefix``."""
+        prefix = (prefix or '').strip().lower()
+        if not prefix:
+            return self.options[:limit]
+        return [self.options[i] for i in self._search(prefix, limit)]
+
+    def register_callback(self, app, dropdown_id, limit=50):
+        """
+        Fill ``dropdown_id``'s options from its ``search_value`` as the user
+        types. The current selection is always kept in the list, otherwise a
+        multi-select dropdown would drop the chosen items.
+        """
+        @app.callback(
+            Output(dropdown_id, 'options'),
+            [Input(dropdown_id, 'search_value')],
+            [State(dropdown_id, 'value')])
+        def update_options(search_value, value):
+            chosen = self.selected(value)
+            found = [o for o in self.search(search_value, limit)
+                     if o not in chosen]
+            return chosen + found
+
+        return update_options
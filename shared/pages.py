@@ -0,0 +1,79 @@
+"""
+A page registry for multi-page Dash apps.
+
+The usual ``render_page_content(pathname)`` callback builds the page's
+component tree from scratch on every navigation. PageRegistry maps each
+pathname to the name of a module defining ``layout`` (a component, or a
+function returning one). The module is only imported the first time its
+page is visited, and the layout is serialized once and kept as plain JSON
+data, so going back to a page returns the cached copy:
+
+    pages = PageRegistry(
+        {'/page-1': 'pages.page_1', '/page-2': 'pages.page_2'},
+        aliases={'/': '/page-1'},
+        not_found='pages.not_found',   # layout(pathname) for unknown paths
+    )
+    pages.preload('/')                 # import just the landing page now
+
+    @app.callback(Output('page-content', 'children'),
+                  [Input('url', 'pathname')])
+    def render_page_content(pathname):
+        return pages.layout(pathname)
+"""
+import importlib
+import json
+import threading
+
+from shared.figures import to_json
+
+
+class PageRegistry:
+    """Pathname -> lazily imported page module, with memoized layouts."""
+
+    def __init__(self, routes, aliases=None, not_found=None):
+        self.routes = dict(routes)
+        self.aliases = dict(aliases or {})
+        self.not_found = not_found
+        self._lock = threading.Lock()
+        self._layouts = {}
+
+    def resolve(self, pathname):
+        """The registered path for ``pathname``, or None if it has none."""
+        pathname = self.aliases.get(pathname, pathname)
+        return pathname if pathname in self.routes else None
+
+    def _build(self, module_name, *args):
+        layout = importlib.import_module(module_name).layout
+        if callable(layout):
+            layout = layout(*args)
+        text = to_json(layout)
+        return json.loads(text), text.encode()
+
+    def _entry(self, pathname):
+        path = self.resolve(pathname)
+        if path is None:
+            # not cached: there's no end to the paths people can type
+            if self.not_found is None:
+                raise KeyError(pathname)
+            return self._build(self.not_found, pathname)
+        with self._lock:
+            if path not in self._layouts:
+                self._layouts[path] = self._build(self.routes[path])
+            return self._layouts[path]
+
+    def layout(self, pathname):
+        """The page for ``pathname`` as plain dicts and lists."""
+        return self._entry(pathname)[0]
+
+    def layout_json(self, pathname):
+        """The page for ``pathname`` as serialized JSON bytes."""
+        return self._entry(pathname)[1]
+
+    def preload(self, *pathnames):
+        """Import and serialize these pages now rather than on first visit."""
+        for pathname in pathnames:
+            self._entry(pathname)
+
+    def clear(self):
+        with self._lock:
+            self._layouts = {}
@@ -0,0 +1,248 @@
+"""
+Cached, concurrent daily price lookups for the Stock Ticker dashboard.
+
+PriceService keeps a date-indexed OHLC frame per ticker on disk, together
+with the date ranges that have already been fetched, so a request only goes
+to the data source for the days it has never seen. Several tickers are
+fetched at once in a bounded thread pool, so refreshing five tickers costs
+about one round trip instead of five.
+
+The data source is any callable ``source(ticker, start, end)`` returning a
+DataFrame indexed by date. The default one calls pandas_datareader; tests
+(or offline demos) can pass a FrameSource holding local frames instead:
+
+    service = PriceService(source=FrameSource({'TSLA': tsla_df}))
+    frames = service.histories(['TSLA'], start, end)
+
+Tickers come straight from the browser, so they are checked before any
+disk or network access: against ``symbols`` when the service is given the
+list of known symbols, and always against SYMBOL_PATTERN. Unknown tickers
+raise ValueError.
+"""
+import datetime
+import json
+import os
+import re
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from shared import datasets
+
+STORE_DIR = os.environ.get(
+    'PRICE_CACHE_DIR', os.path.join(datasets.ROOT_DIR, '.price_cache')
+)
+ONE_DAY = datetime.timedelta(days=1)
+# the columns of the IEX daily frames, for an empty result
+COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+# what a ticker may look like, e.g. TSLA or BRK.B; also a safe file name
+SYMBOL_PATTERN = re.compile(r'^[A-Z.\-]{1,10}$')
+
+
+def check_ticker(ticker, symbols=None):
+    """
+    ``ticker`` upper-cased, or ValueError if it is not a ticker symbol (or
+    not one of ``symbols``, when given).
+    """
+    symbol = ticker.upper() if isinstance(ticker, str) else ''
+    if not SYMBOL_PATTERN.match(symbol) or \
+            (symbols is not None and symbol not in symbols):
+        raise ValueError('Unknown ticker {!r}'.format(ticker))
+    return symbol
+
+
+def iex_source(ticker, start, end):
+    """Fetch daily prices from IEX through pandas_datareader (v0.6.0+)."""
+    import pandas_datareader.data as web
+    return web.DataReader(ticker, 'iex', start, end)
+
+
+class FrameSource:
+    """
+    Stand-in data source serving slices of in-memory frames. ``delay``
+    simulates network latency and ``calls`` records every request made, so
+    tests can check what was (and wasn't) fetched.
+    """
+
+    def __init__(self, frames, delay=0):
+        self.frames = {tic: _normalize(df) for tic, df in frames.items()}
+        self.delay = delay
+        self.calls = []
+
+    def __call__(self, ticker, start, end):
+        self.calls.append((ticker, start, end))
+        if self.delay:
+            time.sleep(self.delay)
+        if ticker not in self.frames:
+            raise KeyError('Unknown ticker {!r}'.format(ticker))
+        return self.frames[ticker].loc[str(start):str(end)]
+
+
+def _as_date(value):
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+
+
+def _normalize(df):
+    df = df.copy()
+    df.index = pd.to_datetime(df.index)
+    df.index.name = 'date'
+    return df.sort_index()
+
+
+def merge_ranges(ranges):
+    """Merge overlapping or touching (start, end) date ranges."""
+    merged = []
+    for lo, hi in sorted(ranges):
+        if merged and lo <= merged[-1][1] + ONE_DAY:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+        else:
+            merged.append((lo, hi))
+    return merged
+
+
+def missing_ranges(covered, start, end):
+    """Return the parts of [start, end] not inside any of the covered ranges."""
+    gaps = []
+    cursor = start
+    for lo, hi in covered:
+        if hi < cursor:
+            continue
+        if lo > end:
+            break
+        if lo > cursor:
+            gaps.append((cursor, lo - ONE_DAY))
+        cursor = hi + ONE_DAY
+        if cursor > end:
+            break
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+class PriceStore:
+    """
+    On-disk store of one price frame (as CSV) and its covered date ranges
+    per ticker, with the ``max_entries`` most recently used kept in memory.
+    """
+
+    def __init__(self, directory=STORE_DIR, max_entries=64):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _paths(self, ticker):
+        stem = os.path.join(self.directory, check_ticker(ticker))
+        return stem + '.csv', stem + '.json'
+
+    def _remember(self, ticker, frame, covered):
+        with self._lock:
+            self._memory[ticker] = frame, covered
+            self._memory.move_to_end(ticker)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def load(self, ticker):
+        """Return ``(frame, covered_ranges)``; empty if nothing is stored."""
+        with self._lock:
+            if ticker in self._memory:
+                self._memory.move_to_end(ticker)
+                return self._memory[ticker]
+        frame_path, ranges_path = self._paths(ticker)
+        try:
+            frame = pd.read_csv(frame_path, index_col='date', parse_dates=True)
+            with open(ranges_path) as f:
+                covered = [(_as_date(lo), _as_date(hi)) for lo, hi in json.load(f)]
+        except (OSError, ValueError):
+            frame, covered = None, []
+        self._remember(ticker, frame, covered)
+        return frame, covered
+
+    def save(self, ticker, frame, covered):
+        frame_path, ranges_path = self._paths(ticker)
+        self._remember(ticker, frame, covered)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            frame.to_csv(frame_path)
+            with open(ranges_path, 'w') as f:
+                json.dump([(str(lo), str(hi)) for lo, hi in covered], f)
+        except OSError:
+            pass  # keep serving from memory if the disk store is unusable
+
+
+class PriceService:
+    """Fetch price histories concurrently, only asking the source for new days."""
+
+    def __init__(self, source=iex_source, store=None, max_workers=8,
+                 symbols=None):
+        self.source = source
+        self.store = store if store is not None else PriceStore()
+        self.symbols = None if symbols is None else {
+            str(symbol).upper() for symbol in symbols}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        # the gaps of one ticker are fetched here, in parallel; a pool of
+        # its own, as history() already runs in one of _executor's threads
+        self._fetcher = ThreadPoolExecutor(max_workers=max_workers)
+        # a lock lives only while some thread holds or waits for it
+        self._locks = weakref.WeakValueDictionary()
+        self._locks_lock = threading.Lock()
+
+    def _lock_for(self, ticker):
+        with self._locks_lock:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def known(self, tickers):
+        """The tickers that history() accepts, upper-cased, in order."""
+        symbols = []
+        for ticker in tickers or []:
+            try:
+                symbols.append(check_ticker(ticker, self.symbols))
+            except ValueError:
+                pass
+        return symbols
+
+    def history(self, ticker, start, end):
+        """
+        Return the stored prices of one ticker between start and end (in
+        either order); an empty frame if the source has none.
+        """
+        ticker = check_ticker(ticker, self.symbols)
+        start, end = sorted([_as_date(start), _as_date(end)])
+        # two sessions asking for the same ticker wait for one fetch
+        with self._lock_for(ticker):
+            frame, covered = self.store.load(ticker)
+            gaps = missing_ranges(covered, start, end)
+            if gaps:
+                frames = [] if frame is None else [frame]
+                futures = [self._fetcher.submit(self.source, ticker, lo, hi)
+                           for lo, hi in gaps]
+                frames.extend(_normalize(f.result()) for f in futures)
+                frame = pd.concat(frames)
+                frame = frame[~frame.index.duplicated(keep='last')].sort_index()
+                # today's bar isn't final yet, so never mark it as covered
+                yesterday = datetime.date.today() - ONE_DAY
+                covered = merge_ranges(
+                    covered + [(lo, min(hi, yesterday)) for lo, hi in gaps
+                               if lo <= yesterday]
+                )
+                self.store.save(ticker, frame, covered)
+        if frame is None:
+            return pd.DataFrame(
+                columns=COLUMNS, index=pd.DatetimeIndex([], name='date'))
+        return frame.loc[str(start):str(end)]
+
+    def histories(self, tickers, start, end):
+        """Fetch several tickers in parallel; returns {ticker: frame} in order."""
+        futures = [
+            self._executor.submit(self.history, tic, start, end)
+            for tic in tickers
+        ]
+        return {tic: f.result() for tic, f in zip(tickers, futures)}
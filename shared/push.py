@@ -0,0 +1,164 @@
+"""
+Server-sent events (SSE) for pushing live data to the browser.
+
+With ``dcc.Interval`` every open page asks the server for an update on
+every tick, changed or not. Here the server pushes a message down one
+long-lived HTTP response per page, and only when something was published:
+
+    publisher = Publisher()
+    register_sse(app.server, publisher)            # serves /events/<topic>
+    publisher.publish('flights', {'y': 1234}, id=seq)
+
+and in the browser (e.g. from a file in the app's assets/ folder):
+
+    new EventSource('/events/flights').onmessage = function (e) { ... };
+
+Publisher is a plain in-process pub/sub, so it can be used (and tested)
+without any web server at all. Messages carry an ``id``; a reconnecting
+browser sends the last one it got as ``Last-Event-ID`` and the route can
+replay what it missed.
+
+Each open stream holds one server thread, so run apps using this on a
+threaded server (the Flask dev server is) or an async gunicorn worker.
+"""
+import collections
+import json
+import queue
+import threading
+
+
+class Subscription:
+    """A subscriber's queue of ``(id, data)`` messages for one topic."""
+
+    def __init__(self, publisher, topic, maxsize):
+        self.publisher = publisher
+        self.topic = topic
+        self._queue = queue.Queue(maxsize)
+
+    def put(self, message):
+        # a slow reader drops its oldest message rather than stalling
+        # the publisher or growing without bound
+        while True:
+            try:
+                self._queue.put_nowait(message)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout=None):
+        """The next message, or None if none arrived within ``timeout``."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.publisher.unsubscribe(self)
+
+
+class Publisher:
+    """In-process publish/subscribe hub keyed by topic name."""
+
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self._subscribers = collections.defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic):
+        subscription = Subscription(self, topic, self.queue_size)
+        with self._lock:
+            self._subscribers[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers[subscription.topic].discard(subscription)
+
+    def subscriber_count(self, topic):
+        with self._lock:
+            return len(self._subscribers[topic])
+
+    def publish(self, topic, data, id=None):
+        """Send ``data`` to everyone subscribed to ``topic``."""
+        with self._lock:
+            subscribers = list(self._subscribers[topic])
+        for subscription in subscribers:
+            subscription.put((id, data))
+        return len(subscribers)
+
+
+def format_sse(data, id=None, event=None):
+    """Encode one message in the text/event-stream wire format."""
+    lines = []
+    if event is not None:
+        lines.append('event: {}'.format(event))
+    if id is not None:
+        lines.append('id: {}'.format(id))
+    for line in json.dumps(data).splitlines():
+        lines.append('data: {}'.format(line))
+    return '\n'.join(lines) + '\n\n'
+
+
+def event_stream(subscription, replay=(), heartbeat=15):
+    """
+    Yield SSE text for ``replay`` followed by every message published to
+    the subscription. A comment line is sent after ``heartbeat`` idle
+    seconds so proxies keep the connection open and a closed browser tab
+    is noticed (the write fails and the subscription is dropped).
+    """
+    try:
+        for id, data in replay:
+            yield format_sse(data, id)
+        while True:
+            message = subscription.get(timeout=heartbeat)
+            if message is None:
+                yield ': keep-alive\n\n'
+            else:
+                yield format_sse(message[1], message[0])
+    finally:
+        subscription.close()
+
+
+def last_event_id(header):
+    """
+    The Last-Event-ID header as an int; None when it is missing or is not a
+    number (a client we cannot trust to resume, treated as a new one).
+    """
+    try:
+        return int(header)
+    except (TypeError, ValueError):
+        return None
+
+
+def register_sse(server, publisher, route='/events/<topic>', replay=None,
+                 heartbeat=15):
+    """
+    Add an SSE endpoint to a Flask ``server`` (``app.server`` in Dash).
+
+    ``replay(topic, last_id)``, if given, returns the ``(id, data)``
+    messages a reconnecting client missed, where ``last_id`` is the
+    browser's Last-Event-ID header as an int (None on a first connection,
+    or if the header is not a number).
+    """
+    from flask import Response, request, stream_with_context
+
+    def events(topic):
+        # subscribe before replaying so nothing published in between is lost
+        subscription = publisher.subscribe(topic)
+        missed = ()
+        if replay is not None:
+            missed = replay(
+                topic, last_event_id(request.headers.get('Last-Event-ID')))
+        response = Response(
+            stream_with_context(event_stream(subscription, missed, heartbeat)),
+            mimetype='text/event-stream',
+        )
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Accel-Buffering'] = 'no'  # don't let nginx buffer
+        return response
+
+    server.add_url_rule(route, 'sse:' + route, events)
+    return events
@@ -0,0 +1,58 @@
+"""
+Constant-time row lookups for hover and click callbacks.
+
+Hover callbacks fire at mouse-move rates, and each ``df.iloc[i][col]``
+builds a whole Series just to read one value. RecordStore copies the
+columns once into plain Python lists (a struct of arrays), so a lookup is
+a list index, and caches column statistics such as ``min`` the first time
+they are asked for:
+
+    cars = RecordStore(df, ['name', 'cylinders', 'acceleration'])
+    point = cars.row(hoverData['points'][0]['pointIndex'])
+    point['name'], cars.min('acceleration')
+"""
+
+
+class RecordStore:
+    """Struct-of-arrays copy of some DataFrame columns, indexed by position."""
+
+    def __init__(self, df, columns=None):
+        self.names = list(columns if columns is not None else df.columns)
+        # .tolist() gives native Python values (int/float/str), so nothing
+        # returned from a lookup carries numpy or pandas overhead
+        self.columns = {name: df[name].tolist() for name in self.names}
+        self._length = len(df)
+        self._stats = {}
+
+    def __len__(self):
+        return self._length
+
+    def get(self, column, i):
+        """One value, by column name and row position."""
+        return self.columns[column][i]
+
+    def row(self, i):
+        """Every stored column of row ``i`` as a dict."""
+        return {name: values[i] for name, values in self.columns.items()}
+
+    def _stat(self, func, column):
+        key = func.__name__, column
+        if key not in self._stats:
+            self._stats[key] = func(self.columns[column])
+        return self._stats[key]
+
+    def min(self, column):
+        return self._stat(min, column)
+
+    def max(self, column):
+        return self._stat(max, column)
+
+
+def lookup_table(df, key_columns, value_column):
+    """
+    Map each row's key columns to one value column, e.g.
+    ``lookup_table(df, ['wheels', 'color'], 'image')[(2, 'red')]``.
+    Replaces a boolean-mask filter over the whole frame per lookup.
+    """
+    keys = zip(*(df[name].tolist() for name in key_columns))
+    return dict(zip(keys, df[value_column].tolist()))
@@ -0,0 +1,103 @@
+"""
+Publish the chart scripts' HTML files against one shared copy of plotly.js.
+
+``pyo.plot(fig, filename=...)`` inlines all of plotly.js (about 2.4MB) into
+every file it writes. ``report.plot`` takes the same arguments and does
+exactly that by default, so a chart still opens as one standalone file. In
+publishing mode, switched on by setting PLOTLY_REPORT_DIR, it instead
+writes
+
+    $PLOTLY_REPORT_DIR/assets/plotly-<version>.<hash>.min.js   (once)
+    $PLOTLY_REPORT_DIR/<section folder>/<filename>             (per chart)
+
+where each chart is a small page holding only its figure and a <script>
+tag for the shared asset. The asset's name includes a hash of its content,
+so it can be served with a far-future cache header and a plotly upgrade
+gets a new file rather than a stale cached one. The figure's numeric
+arrays are written as base64 typed arrays (see shared/typedarrays.py)
+rather than decimal text. For example:
+
+    PLOTLY_REPORT_DIR=../reports python bar1.py
+"""
+import hashlib
+import os
+from functools import lru_cache
+
+import plotly
+import plotly.offline as pyo
+from plotly import tools
+
+from shared import typedarrays
+
+REPORT_DIR = os.environ.get('PLOTLY_REPORT_DIR')
+ASSET_DIR = 'assets'
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<script src="{src}"></script>
+<script>
+{decoder}
+</script>
+</head>
+<body>
+{div}
+</body>
+</html>
+"""
+
+
+@lru_cache(maxsize=None)
+def plotlyjs_asset(directory):
+    """
+    Write plotly.js into ``directory`` (once) under a name made of the
+    plotly version and a hash of the script. Returns the file's path.
+    """
+    source = pyo.get_plotlyjs().encode()
+    digest = hashlib.sha256(source).hexdigest()[:12]
+    path = os.path.join(
+        directory, 'plotly-{}.{}.min.js'.format(plotly.__version__, digest))
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        tmp = '{}.{}.tmp'.format(path, os.getpid())
+        with open(tmp, 'wb') as f:
+            f.write(source)
+        os.replace(tmp, path)
+    return path
+
+
+def write_chart(figure_or_data, path, asset_path, **kwargs):
+    """Write one figure-only HTML page that loads plotly.js from asset_path."""
+    # validate first: the typed array blocks are not valid attribute values
+    # for plotly.py, only for plotly.js
+    figure = tools.return_figure_from_figure_or_data(
+        figure_or_data, kwargs.pop('validate', True))
+    figure = typedarrays.encode(figure, typed=True)
+    div = pyo.plot(figure, output_type='div', include_plotlyjs=False,
+                   validate=False, **kwargs)
+    src = os.path.relpath(asset_path, os.path.dirname(os.path.abspath(path)))
+    title = os.path.splitext(os.path.basename(path))[0]
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(PAGE.format(title=title, src=src.replace(os.sep, '/'),
+                            decoder=typedarrays.DECODER_JS, div=div))
+    return path
+
+
+def chart_path(filename, report_dir=None):
+    """Where publishing mode puts a chart: a folder per section."""
+    report_dir = report_dir or REPORT_DIR
+    section = os.path.basename(os.getcwd())
+    return os.path.join(report_dir, section, os.path.basename(filename))
+
+
+def plot(figure_or_data, filename='temp-plot.html', auto_open=True,
+         **kwargs):
+    """``pyo.plot``, or a shared-asset page when publishing (not opened)."""
+    if not REPORT_DIR:
+        return pyo.plot(figure_or_data, filename=filename,
+                        auto_open=auto_open, **kwargs)
+    asset = plotlyjs_asset(os.path.join(REPORT_DIR, ASSET_DIR))
+    return write_chart(figure_or_data, chart_path(filename), asset, **kwargs)
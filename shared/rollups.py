@@ -0,0 +1,160 @@
+"""
+Pre-aggregated rollups of the Fremont Bridge bicycle counts.
+
+FremontBridgeBicycles.csv holds one row per hour with a West and an East
+sidewalk count. Instead of parsing the timestamps and regrouping ~47k rows
+every time a chart is drawn, FremontRollups parses them once (with an
+explicit format, which is far faster than letting pandas guess) and keeps
+four aggregates up to date:
+
+    by_hour()           totals per hour of the day          (24 rows)
+    by_weekday_hour()   totals per weekday and hour         (7 x 24)
+    daily()             totals per calendar day
+    monthly()           totals per calendar month
+
+and the parsed hourly counts themselves (hourly()), for charts of the
+whole series.
+
+Rows appended to the CSV later are folded in by refresh(), which only parses
+the bytes written since the last read.
+"""
+import datetime
+import io
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from shared import datasets
+
+FREMONT_FILE = 'FremontBridgeBicycles.csv'
+DATE_COLUMN = 'Date'
+DATE_FORMAT = '%m/%d/%Y %H:%M'
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday',
+            'Saturday', 'Sunday']
+
+
+class FremontRollups:
+    """Hourly, daily, weekday-by-hour and monthly sums of the sidewalk counts."""
+
+    def __init__(self, name=FREMONT_FILE):
+        self.path = datasets.find_file(name)
+        self._lock = threading.Lock()
+        self.rebuild()
+
+    def rebuild(self):
+        """Throw the aggregates away and recompute them from the whole file."""
+        with self._lock:
+            # note the size first: anything appended while we read is picked
+            # up (again) by the next refresh() rather than silently skipped
+            size = os.path.getsize(self.path)
+            raw = datasets.read_csv(self.path)
+            self.columns = [c for c in raw.columns if c != DATE_COLUMN]
+            n = len(self.columns)
+            self._hour = np.zeros((24, n))
+            self._weekday_hour = np.zeros((7, 24, n))
+            self._daily = pd.DataFrame(columns=self.columns, dtype=float)
+            self._monthly = pd.DataFrame(columns=self.columns, dtype=float)
+            self._times = np.array([], dtype='datetime64[ns]')
+            self._counts = np.zeros((0, n))
+            self.rows = 0
+            self.last_timestamp = None
+            self._add(raw)
+            self._offset = size
+
+    def refresh(self):
+        """
+        Fold in rows appended to the CSV since the last read and return how
+        many were added. If the file shrank it was rewritten, so everything
+        is rebuilt instead.
+        """
+        size = os.path.getsize(self.path)
+        if size < self._offset:
+            self.rebuild()
+            return self.rows
+        if size == self._offset:
+            return 0
+        with self._lock:
+            with open(self.path, 'rb') as f:
+                f.seek(self._offset)
+                chunk = f.read(size - self._offset)
+            # a writer may be half way through a line; leave it for next time
+            end = chunk.rfind(b'\n') + 1
+            if not end:
+                return 0
+            new = pd.read_csv(
+                io.BytesIO(chunk[:end]),
+                header=None,
+                names=[DATE_COLUMN] + self.columns,
+            )
+            self._add(new)
+            self._offset += end
+            return len(new)
+
+    def _add(self, df):
+        if not len(df):
+            return
+        stamps = pd.to_datetime(df[DATE_COLUMN], format=DATE_FORMAT)
+        counts = df[self.columns].fillna(0).values.astype(float)
+
+        hour = stamps.dt.hour.values
+        weekday = stamps.dt.weekday.values
+        np.add.at(self._hour, hour, counts)
+        np.add.at(self._weekday_hour, (weekday, hour), counts)
+
+        frame = pd.DataFrame(counts, columns=self.columns)
+        day = frame.groupby(stamps.dt.normalize().values).sum()
+        month = frame.groupby(
+            stamps.values.astype('datetime64[M]').astype('datetime64[ns]')
+        ).sum()
+        self._daily = self._daily.add(day, fill_value=0)
+        self._monthly = self._monthly.add(month, fill_value=0)
+        self._times = np.concatenate(
+            [self._times, stamps.values.astype('datetime64[ns]')])
+        self._counts = np.concatenate([self._counts, counts])
+
+        self.rows += len(df)
+        latest = stamps.max()
+        if self.last_timestamp is None or latest > self.last_timestamp:
+            self.last_timestamp = latest
+
+    def by_hour(self):
+        """
+        Totals per hour of the day, indexed by ``datetime.time`` like the
+        ``groupby(df['Date'].dt.time).sum()`` it replaces.
+        """
+        index = pd.Index([datetime.time(h) for h in range(24)], name='Hour')
+        return pd.DataFrame(self._hour.copy(), index=index,
+                            columns=self.columns)
+
+    def hourly(self):
+        """The counts of every hour, indexed by their parsed timestamps."""
+        index = pd.DatetimeIndex(self._times, name=DATE_COLUMN)
+        return pd.DataFrame(self._counts.copy(), index=index,
+                            columns=self.columns)
+
+    def by_weekday_hour(self, column):
+        """Totals of one count column as a weekday (rows) by hour table."""
+        i = self.columns.index(column)
+        return pd.DataFrame(self._weekday_hour[:, :, i].copy(),
+                            index=WEEKDAYS, columns=range(24))
+
+    def daily(self):
+        """Totals per calendar day."""
+        return self._daily.sort_index().copy()
+
+    def monthly(self):
+        """Totals per calendar month, indexed by the first of the month."""
+        return self._monthly.sort_index().copy()
+
+
+_rollups = None
+
+
+def fremont_rollups():
+    """Return the process-wide FremontRollups, building it on first use."""
+    global _rollups
+    if _rollups is None:
+        _rollups = FremontRollups()
+    return _rollups
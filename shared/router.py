@@ -0,0 +1,93 @@
+"""
+One callback per navigation for multi-page apps with sidebars.
+
+Sidebar apps typically have one callback rendering the page, another
+setting the ``active`` flags of the nav links, and a pair of callbacks per
+collapsible submenu (one toggling it, one restyling its header once it has
+toggled). Each is its own HTTP request, so a navigation costs two round
+trips, a submenu click two more, and the first page load one per callback.
+
+Router answers all of it in one callback. Everything a pathname decides
+(the page, which link is active, which submenu holds the page) comes from a
+dispatch table built once from the PageRegistry's routes:
+
+    router = Router(
+        pages,                                    # a shared.pages.PageRegistry
+        links={'page-1-link': '/page-1', 'page-2-link': '/page-2'},
+        submenus={'submenu-1': ['/page-1/1', '/page-1/2']},
+    )
+    router.register(app)
+
+Submenus follow the sidebar-with-submenus naming: the header is ``id``,
+the collapse ``id + '-collapse'``, and the header gets the class ``open``
+while the submenu is open. A navigation opens the submenu holding the new
+page and leaves the others as they are.
+"""
+import dash
+from dash.dependencies import Input, Output, State
+
+
+class Router:
+    """Resolves a pathname to page, link and submenu state in one callback."""
+
+    def __init__(self, pages, links=None, submenus=None):
+        self.pages = pages
+        self.links = dict(links or {})
+        self.submenus = {k: set(v) for k, v in (submenus or {}).items()}
+        self._table = {
+            path: self._dispatch(path)
+            for path in list(pages.routes) + list(pages.aliases)
+        }
+        self._nowhere = self._dispatch(None)
+
+    def _dispatch(self, pathname):
+        path = self.pages.resolve(pathname) if pathname is not None else None
+        active = tuple(path == target for target in self.links.values())
+        holds = tuple(path in paths for paths in self.submenus.values())
+        return active, holds
+
+    def resolve(self, pathname):
+        """``(active link flags, submenus holding the page)`` for a pathname."""
+        return self._table.get(pathname, self._nowhere)
+
+    def _submenu_outputs(self, is_open):
+        return list(is_open) + ['open' if o else '' for o in is_open]
+
+    def route(self, pathname, clicks=(), is_open=()):
+        """
+        The callback's return values: page content, each link's ``active``,
+        each submenu's ``is_open`` and each submenu header's className.
+        """
+        is_open = [bool(o) for o in is_open]
+        triggered = {t['prop_id'] for t in dash.callback_context.triggered}
+        toggled = [
+            '{}.n_clicks'.format(submenu) in triggered
+            for submenu in self.submenus
+        ]
+        if any(toggled):
+            # a submenu header was clicked: nothing about the page changes
+            is_open = [o != t for o, t in zip(is_open, toggled)]
+            return [dash.no_update] * (1 + len(self.links)) + \
+                self._submenu_outputs(is_open)
+
+        active, holds = self.resolve(pathname)
+        is_open = [o or h for o, h in zip(is_open, holds)]
+        return [self.pages.layout(pathname)] + list(active) + \
+            self._submenu_outputs(is_open)
+
+    def register(self, app, location_id='url', content_id='page-content'):
+        """Add the routing callback to ``app``."""
+        outputs = [Output(content_id, 'children')]
+        outputs += [Output(link, 'active') for link in self.links]
+        outputs += [Output(s + '-collapse', 'is_open') for s in self.submenus]
+        outputs += [Output(s, 'className') for s in self.submenus]
+        inputs = [Input(location_id, 'pathname')]
+        inputs += [Input(s, 'n_clicks') for s in self.submenus]
+        states = [State(s + '-collapse', 'is_open') for s in self.submenus]
+        n = len(self.submenus)
+
+        @app.callback(outputs, inputs, states)
+        def route(pathname, *args):
+            return self.route(pathname, args[:n], args[n:])
+
+        return route
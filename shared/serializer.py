@@ -0,0 +1,156 @@
+"""
+Pluggable JSON serialization for Dash's callback responses and layouts.
+
+Dash turns every callback response, and the layout it serves at
+/_dash-layout, into JSON with plotly's PlotlyJSONEncoder: the stdlib json
+module walking each nested dict, list and component in Python and calling
+back into the encoder for every object it does not know. OrjsonSerializer
+does the same job with orjson, which walks dicts and lists in C and writes
+NumPy arrays straight from their buffers; the Python ``default`` hook only
+sees Dash components, graph objects and pandas values. JSONSerializer is
+the stdlib behaviour, kept for comparison (see benchmarks/serializers.py).
+
+The apps call install() next to ``app = dash.Dash()``, so their callback
+responses and layout are encoded with orjson when it is installed:
+
+    app = dash.Dash()
+    serializer.install()
+
+install() replaces the encoder Dash uses for the whole process. Without
+orjson, or with DASH_SERIALIZER=json, it leaves Dash's own encoder alone:
+Dash 2's plotly.io based one is faster than JSONSerializer.
+"""
+import datetime
+import decimal
+import importlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from plotly.utils import PlotlyJSONEncoder
+
+
+class JSONSerializer:
+    """The stdlib json module with plotly's encoder, as Dash does it."""
+
+    name = 'json'
+
+    def dumps(self, obj):
+        return json.dumps(obj, cls=PlotlyJSONEncoder)
+
+
+class OrjsonSerializer:
+    """orjson, with a fallback hook for components, figures and pandas."""
+
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+        self.options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def default(self, obj):
+        """Anything orjson does not know natively, as something it does."""
+        if hasattr(obj, 'to_plotly_json'):
+            return obj.to_plotly_json()  # components and graph objects
+        if isinstance(obj, (pd.Series, pd.Index)):
+            obj = obj.to_numpy()
+        if isinstance(obj, np.ndarray):
+            # orjson writes C-contiguous numeric arrays itself
+            if obj.dtype.kind in 'biuf' and not obj.flags.c_contiguous:
+                return np.ascontiguousarray(obj)
+            if obj.dtype.kind == 'M':
+                return [None if v == 'NaT' else v
+                        for v in np.datetime_as_string(obj).tolist()]
+            return obj.tolist()
+        if isinstance(obj, np.generic):
+            return obj.item()
+        if obj is pd.NaT:
+            return None
+        if isinstance(obj, pd.Timestamp):
+            return obj.isoformat()
+        if isinstance(obj, datetime.date):
+            return obj.isoformat()
+        if isinstance(obj, decimal.Decimal):
+            return float(obj)
+        raise TypeError('Object of type {} is not JSON serializable'.format(
+            type(obj).__name__))
+
+    def dumps(self, obj):
+        try:
+            return self._orjson.dumps(
+                obj, default=self.default, option=self.options).decode()
+        except TypeError:
+            # values orjson refuses outright, e.g. NaT in a datetime64 array
+            return json.dumps(obj, cls=PlotlyJSONEncoder)
+
+
+SERIALIZERS = {
+    'json': JSONSerializer,
+    'orjson': OrjsonSerializer,
+}
+
+
+def get_serializer(name=None):
+    """
+    A serializer by name. By default DASH_SERIALIZER, or orjson when it is
+    installed and json when it is not.
+    """
+    name = name or os.environ.get('DASH_SERIALIZER')
+    if name is not None:
+        return SERIALIZERS[name]()
+    try:
+        return OrjsonSerializer()
+    except ImportError:
+        return JSONSerializer()
+
+
+class _JSONModule:
+    """The json module, except that dumps(..., cls=PlotlyJSONEncoder) goes
+    through a serializer. Older Dash versions call json.dumps that way."""
+
+    def __init__(self, serializer):
+        self._serializer = serializer
+
+    def dumps(self, obj, cls=None, **kwargs):
+        if cls is not None and issubclass(cls, PlotlyJSONEncoder) and \
+                not kwargs:
+            return self._serializer.dumps(obj)
+        return json.dumps(obj, cls=cls, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(json, name)
+
+
+def install(serializer=None):
+    """
+    Serialize Dash's callback responses and layouts with ``serializer`` (a
+    name or an instance; see get_serializer). Returns the serializer, or
+    None if Dash's encoder was left as it is: when orjson is not installed
+    or 'json' was asked for.
+    """
+    if serializer is None or isinstance(serializer, str):
+        try:
+            serializer = get_serializer(serializer)
+        except ImportError:
+            return None  # DASH_SERIALIZER=orjson without orjson
+    if isinstance(serializer, JSONSerializer):
+        return None
+    import dash.dash
+
+    # Dash 2 imports dash._utils.to_json into the modules that use it
+    patched = False
+    for name in ('dash.dash', 'dash._callback'):
+        try:
+            module = importlib.import_module(name)
+        except ImportError:
+            continue
+        if hasattr(module, 'to_json'):
+            module.to_json = serializer.dumps
+            patched = True
+    if not patched:
+        # older versions call json.dumps(..., cls=PlotlyJSONEncoder)
+        dash.dash.json = _JSONModule(serializer)
+    return serializer
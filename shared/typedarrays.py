@@ -0,0 +1,205 @@
+"""
+Ship figure data arrays as base64 typed arrays instead of decimal text.
+
+The JSON encoders write every float of a trace as text, e.g.
+``0.49671415301123267,`` -- about 20 bytes and a float-to-string
+conversion per number, plus the string-to-float parse in the browser.
+plotly.js also accepts a numeric array as a block of raw little-endian
+bytes:
+
+    {'dtype': 'f8', 'bdata': 'AAAAAAAA8D8AAAAAAAAAQA=='}
+
+which is 8 bytes per float64 before base64 (under 11 after), and costs one
+memcpy to write. ``encode`` swaps every NumPy (or pandas) numeric array in
+a figure for such a block. Anything else -- strings, dates, categoricals,
+object columns, plain lists -- is left as it was for the usual encoder:
+
+    return typedarrays.encode(go.Figure(data=data, layout=layout))
+
+plotly.js reads these blocks natively from v2.28. Callback responses only
+use them when the plotly.js that dcc.Graph loads is that new (set
+DASH_TYPED_ARRAYS=0/1 to decide yourself); otherwise encode leaves NumPy
+arrays to the JSON encoder. Blocks that plotly.py (v6+) already made are
+passed through as they are either way. Offline pages written by
+shared/report.py always use them, and carry DECODER_JS so that older
+plotly.js versions get typed arrays too.
+"""
+import base64
+import glob
+import importlib
+import json
+import os
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from plotly.utils import PlotlyJSONEncoder
+
+# numpy dtype -> plotly.js typed array name; 64 bit ints have no JS type
+DTYPES = {
+    'int8': 'i1', 'uint8': 'u1', 'int16': 'i2', 'uint16': 'u2',
+    'int32': 'i4', 'uint32': 'u4', 'float32': 'f4', 'float64': 'f8',
+}
+NUMPY_DTYPES = {code: np.dtype(name).newbyteorder('<')
+                for name, code in DTYPES.items()}
+# the first plotly.js release that reads {dtype, bdata} blocks
+TYPED_ARRAYS_SINCE = (2, 28)
+
+# Replaces {dtype, bdata[, shape]} blocks with typed arrays before plotting,
+# for plotly.js versions that predate them.
+DECODER_JS = """(function () {
+  var TYPES = {i1: Int8Array, u1: Uint8Array, i2: Int16Array,
+               u2: Uint16Array, i4: Int32Array, u4: Uint32Array,
+               f4: Float32Array, f8: Float64Array};
+  function decode(obj) {
+    if (Array.isArray(obj)) return obj.map(decode);
+    if (!obj || typeof obj !== 'object' || ArrayBuffer.isView(obj)) {
+      return obj;
+    }
+    if (typeof obj.bdata === 'string' && TYPES[obj.dtype]) {
+      var raw = atob(obj.bdata), bytes = new Uint8Array(raw.length);
+      for (var i = 0; i < raw.length; i++) bytes[i] = raw.charCodeAt(i);
+      var values = new TYPES[obj.dtype](bytes.buffer);
+      if (!obj.shape) return values;
+      var cols = Number(String(obj.shape).split(',')[1]), rows = [];
+      for (var r = 0; r < values.length; r += cols) {
+        rows.push(values.subarray(r, r + cols));
+      }
+      return rows;
+    }
+    var out = {};
+    for (var key in obj) out[key] = decode(obj[key]);
+    return out;
+  }
+  var newPlot = Plotly.newPlot;
+  Plotly.newPlot = function (gd, data, layout, config) {
+    return newPlot.call(Plotly, gd, decode(data), decode(layout), config);
+  };
+})();"""
+
+
+def _narrow(values):
+    """int64/uint64 as the smallest int type holding them, else None."""
+    if values.size == 0:
+        return None
+    low, high = values.min(), values.max()
+    kinds = ['int8', 'int16', 'int32'] if values.dtype.kind == 'i' else \
+        ['uint8', 'uint16', 'uint32']
+    for name in kinds:
+        info = np.iinfo(name)
+        if info.min <= low and high <= info.max:
+            return values.astype(name)
+    return None
+
+
+def typed_array(values):
+    """
+    The ``{'dtype', 'bdata'[, 'shape']}`` block for a numeric 1 or 2-d
+    array, or None for values that have to stay as they are.
+    """
+    if isinstance(values, (pd.Series, pd.Index)):
+        if not isinstance(values.dtype, np.dtype):
+            return None  # categoricals, nullable ints, tz-aware dates
+        values = values.to_numpy()
+    if not isinstance(values, np.ndarray) or values.ndim not in (1, 2):
+        return None
+    if values.dtype.name in ('int64', 'uint64'):
+        values = _narrow(values)
+        if values is None:
+            return None
+    code = DTYPES.get(values.dtype.name)
+    if code is None or values.size == 0:
+        return None
+    data = np.ascontiguousarray(values, dtype=NUMPY_DTYPES[code])
+    spec = {'dtype': code, 'bdata': base64.b64encode(data).decode('ascii')}
+    if values.ndim == 2:
+        spec['shape'] = '{}, {}'.format(*values.shape)
+    return spec
+
+
+def decode(spec):
+    """The NumPy array for a typed array block."""
+    values = np.frombuffer(base64.b64decode(spec['bdata']),
+                           dtype=NUMPY_DTYPES[spec['dtype']])
+    if 'shape' in spec:
+        values = values.reshape([int(n) for n in spec['shape'].split(',')])
+    return values
+
+
+def _is_spec(obj):
+    return isinstance(obj.get('bdata'), str) and obj.get('dtype') in \
+        NUMPY_DTYPES
+
+
+def _walk(obj, typed):
+    if hasattr(obj, 'to_plotly_json'):
+        obj = obj.to_plotly_json()
+    if isinstance(obj, dict):
+        if _is_spec(obj):
+            # plotly.py v6+ makes these blocks itself; they are only ever
+            # used with a plotly.js that reads them
+            return obj
+        return {key: _walk(value, typed) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        # lists of traces or annotations; numbers and strings are leaves
+        if obj and isinstance(obj[0], (dict, list, tuple)) or \
+                obj and hasattr(obj[0], 'to_plotly_json'):
+            return [_walk(value, typed) for value in obj]
+        return obj
+    if typed:
+        spec = typed_array(obj)
+        if spec is not None:
+            return spec
+    return obj
+
+
+def dash_plotlyjs_version():
+    """
+    The version of the plotly.js that dcc.Graph loads, as a tuple of ints,
+    or None if it cannot be told. Dash 0.x/1.x and early 2.x ship their own
+    copy with dash_core_components; later releases serve plotly.py's.
+    """
+    for name in ('dash.dcc', 'dash_core_components'):
+        try:
+            package = importlib.import_module(name)
+        except ImportError:
+            continue
+        directory = os.path.dirname(package.__file__)
+        for path in glob.glob(os.path.join(directory, '*plotly*.js')):
+            with open(path, 'rb') as f:
+                match = re.search(rb'plotly\.js v(\d+)\.(\d+)', f.read(4096))
+            if match:
+                return int(match.group(1)), int(match.group(2))
+        break
+    try:
+        from plotly.offline import get_plotlyjs_version
+    except ImportError:
+        return None
+    return tuple(int(n) for n in get_plotlyjs_version().split('.')[:2])
+
+
+@lru_cache(maxsize=None)
+def dash_supports_typed_arrays():
+    """Whether the plotly.js that dcc.Graph loads reads typed arrays."""
+    setting = os.environ.get('DASH_TYPED_ARRAYS')
+    if setting is not None:
+        return setting.lower() not in ('', '0', 'false', 'no')
+    version = dash_plotlyjs_version()
+    return version is not None and version >= TYPED_ARRAYS_SINCE
+
+
+def encode(figure, typed=None):
+    """
+    A figure (go.Figure, dict or list of traces) as plain dicts and lists,
+    with its numeric arrays as typed array blocks if ``typed`` (by default,
+    if dcc.Graph's plotly.js can read them) or left as they are if not.
+    """
+    if typed is None:
+        typed = dash_supports_typed_arrays()
+    return _walk(figure, typed)
+
+
+def to_json(figure):
+    """A figure serialized with typed array blocks, as a str."""
+    return json.dumps(encode(figure, typed=True), cls=PlotlyJSONEncoder)